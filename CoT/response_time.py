@@ -1,38 +1,50 @@
-import pandas as pd 
+import os
+import sys
+
+import pandas as pd
 from datetime import datetime
 
-#  CONFIG 
+# Shared analysis helpers live alongside the DDM scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DDM'))
+from bootstrap import bootstrap_duration_cis
+
+#  CONFIG
 filename = "Spring 2025 CoT HS Administration respondent actions - Spring 2025 CoT HS Administration respondent actions.csv"
 time_format = "%m/%d/%Y %H:%M:%S"  # adjust if needed
+bootstrap_cis = False  # set True to also save bootstrap CIs per form
 
-# LOAD CSV INTO DATAFRAME 
-df = pd.read_csv(filename)
-
-# Merge Date + Time into one column
-df["DateTime"] = pd.to_datetime(df["Date"] + " " + df["Time"], format=time_format)
-
-# Identify pause users 
-pause_flags = df.groupby(["Assignment","Activities"])["Action"].apply(
-    lambda x: any("Pause activity" in a for a in x)
-).reset_index(name="HasPause")
-
-# Get start/end times 
+# Get start/end times
 def get_times(group):
     start = group.loc[group["Action"].str.contains("Begin activity"), "DateTime"].min()
     end = group.loc[group["Action"].str.contains("End activity"), "DateTime"].max()
     return pd.Series({"Start": start, "End": end})
 
-times = df.groupby(["Assignment","Activities"]).apply(get_times).reset_index()
-times["Duration"] = times["End"] - times["Start"]
+def load_cot_times(path, df=None):
+    """
+    Loads the CoT actions CSV and returns same-day exam durations with a HasPause flag.
+    An already-loaded actions frame can be passed as `df` instead.
+    """
+    # LOAD CSV INTO DATAFRAME
+    if df is None:
+        df = pd.read_csv(path)
+
+    # Merge Date + Time into one column (on a new frame; a passed-in df is left as is)
+    df = df.assign(DateTime=pd.to_datetime(df["Date"] + " " + df["Time"], format=time_format))
 
-#  Keep only same-day exams 
-times = times[times["Start"].dt.date == times["End"].dt.date]
+    # Identify pause users
+    pause_flags = df.groupby(["Assignment","Activities"])["Action"].apply(
+        lambda x: any("Pause activity" in a for a in x)
+    ).reset_index(name="HasPause")
 
-# Merge and subset no-pause
-merged = times.merge(pause_flags, on=["Assignment","Activities"])
-no_pause = merged[merged["HasPause"] == False]
+    times = df.groupby(["Assignment","Activities"]).apply(get_times).reset_index()
+    times["Duration"] = times["End"] - times["Start"]
 
-# Compute summary stats 
+    #  Keep only same-day exams
+    times = times[times["Start"].dt.date == times["End"].dt.date]
+
+    return times.merge(pause_flags, on=["Assignment","Activities"])
+
+# Compute summary stats
 def duration_summary(x):
     return pd.Series({
         "Mean": x.mean(),
@@ -46,14 +58,27 @@ def duration_summary(x):
         "P90": x.quantile(0.90)
     })
 
-summary = (
-    no_pause.groupby(["Activities"])["Duration"]
-    .apply(duration_summary)
-    .reset_index()
-)
+if __name__ == "__main__":
+
+    # Merge and subset no-pause
+    merged = load_cot_times(filename)
+    no_pause = merged[merged["HasPause"] == False]
+
+    summary = (
+        no_pause.groupby(["Activities"])["Duration"]
+        .apply(duration_summary)
+        .reset_index()
+    )
+
+    # --- Save to CSV ---
+    output_file = "no_pause_summary_full.csv"
+    summary.to_csv(output_file, index=False)
 
-# --- Save to CSV ---
-output_file = "no_pause_summary_full.csv"
-summary.to_csv(output_file, index=False)
+    print(f"✅ Saved full summary with percentiles to {output_file}")
 
-print(f"✅ Saved full summary with percentiles to {output_file}")
\ No newline at end of file
+    # --- Bootstrap CIs (optional) ---
+    if bootstrap_cis:
+        cis = bootstrap_duration_cis(no_pause, value_col="Duration")
+        ci_file = "no_pause_summary_bootstrap_ci.csv"
+        cis.reset_index().to_csv(ci_file, index=False)
+        print(f"✅ Saved bootstrap confidence intervals to {ci_file}")
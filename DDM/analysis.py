@@ -1,78 +1,212 @@
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 
-def load_and_clean_data(config):
+from effort import compute_effort_indices
+from partitioned import summarize_timestamps
+from sampling import preview_label, sample_actions
+from validation import print_validation_report, validate_actions
+
+PARSE_CHUNK_ROWS = 100_000
+
+
+def timestamp_format(dates, times):
+    """
+    Infers the format of 'Date' + ' ' + 'Time' from the first row where both
+    are present, as pd.to_datetime does for a whole column. Returns None when
+    no row is present or the format cannot be guessed.
+    """
+    present = np.flatnonzero(dates.notna().to_numpy() & times.notna().to_numpy())
+    if not len(present):
+        return None
+    return guess_datetime_format(f"{dates.iloc[present[0]]} {times.iloc[present[0]]}")
+
+
+def parse_timestamps(dates, times, chunk_rows=PARSE_CHUNK_ROWS):
+    """
+    Parses 'Date' + ' ' + 'Time' strings in chunks, so only one chunk of
+    combined strings is held in memory at a time.
+
+    The format is inferred once by `timestamp_format` and used for every
+    chunk; unparseable values become NaT.
+    """
+    date_format = timestamp_format(dates, times)
+    if date_format is None:
+        return pd.to_datetime(dates + ' ' + times, errors='coerce')
+    return pd.concat([
+        pd.to_datetime(dates.iloc[i:i + chunk_rows] + ' ' + times.iloc[i:i + chunk_rows], format=date_format, errors='coerce')
+        for i in range(0, len(dates), chunk_rows)
+    ])
+
+
+def preview_sample(df, config):
+    """
+    Applies the preview sample configured by 'preview_fraction' (and
+    'preview_seed'). The draw is seeded, so every step that samples the same
+    actions frame gets the same assignments.
+
+    Returns:
+        tuple: (df, sample_info), with sample_info None when not previewing.
+    """
+    if not config.get('preview_fraction'):
+        return df, None
+    return sample_actions(df, config['complete_action'], config['preview_fraction'],
+                          seed=config.get('preview_seed', 2025))
+
+
+def load_and_clean_data(config, df=None):
     """
     Loads and cleans respondent data based on a configuration dictionary.
     Includes detailed printouts of students removed at each step.
     
     Args:
         config (dict): A dictionary containing 'file_path', 'complete_action',
-                       and 'filter_pauses'.
+                       and 'filter_pauses'. Optionally 'filter_low_effort'
+                       (with 'min_rte' and 'rapid_threshold') to screen out
+                       rapid-guessing respondents, and 'validate' (with
+                       'strict_validation') to check the export first,
+                       'n_workers' to run the per-assignment steps on
+                       hash-partitioned worker processes, and
+                       'preview_fraction' (with 'preview_seed') to run on a
+                       stratified sample of assignments.
+        df (pd.DataFrame): Optional actions frame that was already loaded
+                           (e.g. by loader.load_inputs); read from
+                           'file_path' if not given. It is not modified.
+
+    Returns:
+        tuple: (actions of the students kept by the pause and completion
+               filters, with 'Assignment', 'Activities', 'Action' and the
+               parsed 'datetime'; one row per student with their duration).
     """
     try:
         file_path = config['file_path']
-        df = pd.read_csv(file_path)
+        if df is None:
+            df = pd.read_csv(file_path)
+
+        # --- Preview Sample ---
+        df, sample_info = preview_sample(df, config)
+        if sample_info:
+            print(f"\n*** {preview_label(sample_info)} ***")
+
+        # --- Validation ---
+        if config.get('validate', False):
+            passed = print_validation_report(validate_actions(df))
+            if not passed and config.get('strict_validation', False):
+                print("Error: Validation failed. Stopping before analysis (strict_validation is on).")
+                return None, None
 
         # --- Initial Count ---
         initial_count = df['Assignment'].nunique()
-        print("\n--- Data Cleaning Funnel ---")
+        print("\n--- Data Cleaning Funnel" + (" (PREVIEW SAMPLE)" if sample_info else "") + " ---")
         print(f"Step 1: Initial total unique students loaded: {initial_count}")
 
-        # --- Data Cleaning ---
-        df['Action'] = df['Action'].astype(str)
-        
+        # --- Query Plan ---
+        # Each filter only decides which assignments survive, so flags are
+        # computed per assignment, combined into one row mask, and the frame
+        # is copied once, after timestamps are parsed for the surviving rows.
+        # String tests run once per distinct action text, not once per row.
+        action_codes, action_values = pd.factorize(df['Action'], use_na_sentinel=False)
+        action_values = pd.Series(action_values).astype(str)
+        is_pause = action_values.str.contains('pause', case=False, na=False).to_numpy()[action_codes]
+        is_complete = (action_values == config['complete_action']).to_numpy()[action_codes]
+
+        codes, assignment_ids = pd.factorize(df['Assignment'])
+        has_id = codes >= 0
+        summary = pd.DataFrame({
+            'has_pause': np.bincount(codes[has_id], weights=is_pause[has_id], minlength=len(assignment_ids)) > 0,
+            'completed': np.bincount(codes[has_id], weights=is_complete[has_id], minlength=len(assignment_ids)) > 0,
+        }, index=assignment_ids)
+        keep = pd.Series(True, index=summary.index)
+
         # --- Pause Filter ---
         if config.get('filter_pauses', True):
-            pause_actions = df[df['Action'].str.contains('pause', case=False, na=False)]
-            assignments_with_pause = pause_actions["Assignment"].unique()
-            
-            print(f"Step 2: Removing {len(assignments_with_pause)} students with 'pause' actions...")
-            df = df[~df["Assignment"].isin(assignments_with_pause)]
-            
-            count_after_pause_filter = df['Assignment'].nunique()
+            print(f"Step 2: Removing {summary['has_pause'].sum()} students with 'pause' actions...")
+            keep &= ~summary['has_pause']
+
+            count_after_pause_filter = int(keep.sum())
             print(f"       Remaining students: {count_after_pause_filter}")
         else:
             print("Step 2: Skipping 'pause' filter (as configured)...")
             count_after_pause_filter = initial_count # No change
 
         # --- Completion Filter ---
-        count_before_completion_filter = df['Assignment'].nunique()
-        
-        complete_action = config['complete_action']
-        completed_actions = df[df['Action'] == complete_action]
-        completed_assignments_ids = completed_actions['Assignment'].unique()
-        
-        df = df[df['Assignment'].isin(completed_assignments_ids)]
-        
-        count_after_completion_filter = df['Assignment'].nunique()
+        count_before_completion_filter = int(keep.sum())
+        keep &= summary['completed']
+
+        count_after_completion_filter = int(keep.sum())
         removed_count = count_before_completion_filter - count_after_completion_filter
-        
+
         print(f"Step 3: Removing {removed_count} students who did not complete the assessment...")
         print(f"       Remaining students: {count_after_completion_filter}")
 
-        # --- Time Calculations ---
-        df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], errors='coerce')
-        df.dropna(subset=['datetime'], inplace=True)
+        # --- Time Calculations (surviving rows only) ---
+        rows = np.flatnonzero(np.append(keep.to_numpy(), False)[codes])
+        dates, times = df['Date'].iloc[rows], df['Time'].iloc[rows]
+        n_workers = config.get('n_workers', 1)
+        spans = None
+        if n_workers > 1 and len(rows):
+            # Timestamps and first/last times of the surviving rows come from
+            # hash-partitioned worker processes
+            spans, datetime = summarize_timestamps(df['Assignment'].to_numpy()[rows], dates, times,
+                                                   timestamp_format(dates, times), n_workers)
+        else:
+            datetime = parse_timestamps(dates, times)
+        parsed = datetime.notna().to_numpy()
+        unparseable_count = len(rows) - parsed.sum()
+        if unparseable_count:
+            print(f"       Dropping {unparseable_count} actions with unparseable timestamps...")
+        rows, datetime = rows[parsed], datetime[parsed]
+
+        df = df.iloc[rows, df.columns.get_indexer(['Assignment', 'Activities'])].assign(
+            Action=action_values.to_numpy()[action_codes[rows]], datetime=datetime)
 
-        time_per_respondent = df.groupby('Assignment')['datetime'].agg(['min', 'max'])
+        if spans is not None:
+            time_per_respondent = spans.dropna(subset=['max'])
+        else:
+            time_per_respondent = df.groupby('Assignment')['datetime'].agg(['min', 'max'])
         time_per_respondent['duration'] = time_per_respondent['max'] - time_per_respondent['min']
-        
+
         count_before_time_filter = len(time_per_respondent)
-        
+
         # --- Time Filter ---
         time_limit_max = pd.Timedelta(minutes = 600)
         time_limit_min = pd.Timedelta(minutes=1)
         time_filtered_df = time_per_respondent[(time_per_respondent['duration'] < time_limit_max) & (time_per_respondent["duration"] > time_limit_min)]
-        time_filtered_df.reset_index(inplace=True)
-        
+        time_filtered_df = time_filtered_df.reset_index()
+
         count_after_time_filter = len(time_filtered_df)
         removed_count = count_before_time_filter - count_after_time_filter
-        
+
         print(f"Step 4: Removing {removed_count} students with durations < 1 min or > 10 hrs...")
+
+        funnel = [
+            ('Initial unique students', initial_count),
+            ('After pause filter', count_after_pause_filter),
+            ('After completion filter', count_after_completion_filter),
+            ('After duration filter', count_after_time_filter),
+        ]
+
+        # --- Effort Filter ---
+        if config.get('filter_low_effort', False):
+            effort = compute_effort_indices(df, threshold_fraction=config.get('rapid_threshold', 0.10))
+            time_filtered_df = pd.merge(time_filtered_df, effort[['Assignment', 'rte']], on='Assignment', how='left')
+            time_filtered_df['rte'] = time_filtered_df['rte'].fillna(1.0)
+
+            min_rte = config.get('min_rte', 0.90)
+            time_filtered_df = time_filtered_df[time_filtered_df['rte'] >= min_rte].reset_index(drop=True)
+
+            removed_count = count_after_time_filter - len(time_filtered_df)
+            count_after_time_filter = len(time_filtered_df)
+            print(f"Step 5: Removing {removed_count} students with response-time effort below {min_rte:.2f}...")
+            funnel.append(('After effort filter', count_after_time_filter))
+
         print(f"       Final analytic sample: {count_after_time_filter} students")
         print("---------------------------------")
 
         print(f"\nData loading and cleaning complete for: {file_path}")
+        # Keep the funnel counts with the result for downstream reports
+        time_filtered_df.attrs['funnel'] = funnel
+        time_filtered_df.attrs['preview'] = sample_info
         return df, time_filtered_df
 
     except FileNotFoundError:
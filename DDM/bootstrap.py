@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+BOOTSTRAP_STATISTICS = ['mean', 'p25', 'median', 'p75', 'p90']
+BOOTSTRAP_QUANTILES = [0.25, 0.50, 0.75, 0.90]
+
+
+def _resample_block(values, n_resamples, seed_seq):
+    """
+    Evaluates one block of bootstrap resamples for a single form.
+
+    The whole block is drawn as one (n_resamples x n) index matrix, and every
+    statistic is evaluated along axis 1 in a single vectorized call.
+
+    Returns:
+        np.ndarray: Array of shape (n_resamples, len(BOOTSTRAP_STATISTICS)).
+    """
+    rng = np.random.default_rng(seed_seq)
+    idx = rng.integers(0, len(values), size=(n_resamples, len(values)))
+    samples = values[idx]
+
+    means = samples.mean(axis=1)
+    quantiles = np.quantile(samples, BOOTSTRAP_QUANTILES, axis=1)
+    return np.column_stack([means, quantiles.T])
+
+
+def bootstrap_duration_cis(summary_df, group_col='Activities', value_col='duration',
+                           n_resamples=2000, confidence=0.95, seed=2025,
+                           block_size=500, n_workers=None):
+    """
+    Computes percentile bootstrap confidence intervals for the per-form
+    duration statistics (mean, p25, median, p75, p90).
+
+    Resamples for each form are split into blocks of `block_size`; each block
+    has its own child seed spawned from `seed`, so results are reproducible
+    regardless of how many workers evaluate them.
+
+    Args:
+        summary_df (pd.DataFrame): One row per respondent with a form column
+                                   and a timedelta duration column.
+        group_col (str): Column identifying the form.
+        value_col (str): Timedelta column to resample.
+        n_resamples (int): Number of bootstrap resamples per form.
+        confidence (float): Confidence level of the intervals.
+        seed (int): Seed for reproducible resampling.
+        block_size (int): Resamples evaluated per task.
+        n_workers (int): Worker processes; 1 evaluates everything in-process.
+
+    Returns:
+        pd.DataFrame: Indexed by form, with '<stat>_lo' and '<stat>_hi'
+                      timedelta columns for every statistic.
+    """
+    groups = {
+        form: pd.to_timedelta(durations).dt.total_seconds().to_numpy()
+        for form, durations in summary_df.groupby(group_col)[value_col]
+    }
+    forms = list(groups)
+    form_seeds = np.random.SeedSequence(seed).spawn(len(forms))
+
+    tasks = []
+    for form, form_seed in zip(forms, form_seeds):
+        block_sizes = [min(block_size, n_resamples - start) for start in range(0, n_resamples, block_size)]
+        for size, block_seed in zip(block_sizes, form_seed.spawn(len(block_sizes))):
+            tasks.append((form, size, block_seed))
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    if n_workers == 1:
+        blocks = [_resample_block(groups[form], size, block_seed) for form, size, block_seed in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            blocks = list(executor.map(
+                _resample_block,
+                [groups[form] for form, _, _ in tasks],
+                [size for _, size, _ in tasks],
+                [block_seed for _, _, block_seed in tasks],
+            ))
+
+    alpha = (1 - confidence) / 2
+    rows = {}
+    for form in forms:
+        stats = np.vstack([block for (task_form, _, _), block in zip(tasks, blocks) if task_form == form])
+        lo, hi = np.quantile(stats, [alpha, 1 - alpha], axis=0)
+        row = {}
+        for name, lo_val, hi_val in zip(BOOTSTRAP_STATISTICS, lo, hi):
+            row[f'{name}_lo'] = pd.Timedelta(seconds=lo_val)
+            row[f'{name}_hi'] = pd.Timedelta(seconds=hi_val)
+        rows[form] = row
+
+    cis = pd.DataFrame.from_dict(rows, orient='index')
+    cis.index.name = group_col
+    return cis
@@ -0,0 +1,212 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from demographics import create_race_variable
+
+# Coded demographic variables, by the name used in the cube and per school level
+DEMOGRAPHIC_DIMENSIONS = {
+    'grade_level': {'HS': 'D.04_grade_level', 'MS': 'D.04_MSgrade_level'},
+    'gender': {'HS': 'D.05_gender', 'MS': 'D.05_gender'},
+    'race_ethnicity': {'HS': 'race.ethn.r', 'MS': 'race.ethn.r'},
+    'native_language': {'HS': 'D.15_Native_Language', 'MS': 'D.15_Native_Language'},
+    'ell': {'HS': 'D.16_ELL', 'MS': 'D.16_ELL'},
+}
+CUBE_DIMENSIONS = ['form', 'level', 'paused', 'completed', 'within_time_limits'] + list(DEMOGRAPHIC_DIMENSIONS)
+
+# Log-spaced duration bins (minutes) for the per-cell quantile sketches
+SKETCH_EDGES = np.geomspace(0.05, 20000, 257)
+
+MISSING_LABEL = 'Missing'
+
+
+def assignment_facts(actions_df, complete_action, level, answers_df=None):
+    """
+    Summarizes each assignment into one row of cube dimensions and its duration.
+
+    Durations run from the first to the last recorded action, as in
+    `load_and_clean_data`; 'within_time_limits' marks the 1 min - 10 hr window
+    used by its time filter.
+
+    Args:
+        actions_df (pd.DataFrame): Raw actions export.
+        complete_action (str): The action that marks a finished assessment.
+        level (str): 'HS' or 'MS'.
+        answers_df (pd.DataFrame): Optional answers data tab, joined on Assignment.
+    """
+    action = actions_df['Action'].astype(str)
+    events = pd.DataFrame({
+        'Assignment': actions_df['Assignment'],
+        'form': actions_df['Activities'],
+        'datetime': pd.to_datetime(actions_df['Date'] + ' ' + actions_df['Time'], errors='coerce'),
+        'paused': action.str.contains('pause', case=False, na=False),
+        'completed': action == complete_action,
+    })
+    facts = events.groupby('Assignment').agg(
+        form=('form', 'first'), start=('datetime', 'min'), end=('datetime', 'max'),
+        paused=('paused', 'any'), completed=('completed', 'any'),
+    )
+    facts['minutes'] = (facts['end'] - facts['start']).dt.total_seconds() / 60
+    facts['within_time_limits'] = (facts['minutes'] > 1) & (facts['minutes'] < 600)
+    facts['level'] = level
+    facts = facts.drop(columns=['start', 'end']).reset_index()
+
+    if answers_df is not None:
+        answers = create_race_variable(answers_df.copy()).drop_duplicates(subset=['Assignment'])
+        columns = {source[level]: name for name, source in DEMOGRAPHIC_DIMENSIONS.items() if source[level] in answers}
+        facts = facts.merge(answers[['Assignment'] + list(columns)].rename(columns=columns), on='Assignment', how='left')
+
+    for name in DEMOGRAPHIC_DIMENSIONS:
+        if name not in facts:
+            facts[name] = MISSING_LABEL
+        # Collapse free-text "other:'...'" answers into a single code
+        values = facts[name].astype(str)
+        facts[name] = values.where(~values.str.startswith('other:'), 'other').where(facts[name].notna(), MISSING_LABEL)
+
+    return facts
+
+
+class AnalysisCube:
+    """
+    Pre-aggregated duration statistics over every combination of the cube
+    dimensions that occurs in the data.
+
+    Each cell holds the count, sum and sum of squares of duration (minutes)
+    plus a fixed-bin histogram sketch, all of which add up under roll-up, so
+    any slice can be answered from the cells without touching raw events.
+    """
+
+    def __init__(self, cells, count, total, total_sq, sketch):
+        self.cells = cells
+        self.count = count
+        self.total = total
+        self.total_sq = total_sq
+        self.sketch = sketch
+
+    @classmethod
+    def build(cls, facts):
+        """Builds the cube from `assignment_facts` rows (one or more levels concatenated)."""
+        facts = facts.dropna(subset=['minutes'])
+        dims = facts[CUBE_DIMENSIONS].astype(str).astype('category')
+        cell_codes = dims.groupby(CUBE_DIMENSIONS, observed=True, sort=True).ngroup().to_numpy()
+        n_cells = cell_codes.max() + 1 if len(cell_codes) else 0
+
+        minutes = facts['minutes'].to_numpy()
+        n_bins = len(SKETCH_EDGES) - 1
+        bins = np.clip(np.searchsorted(SKETCH_EDGES, minutes, side='right') - 1, 0, n_bins - 1)
+
+        cells = dims.groupby(CUBE_DIMENSIONS, observed=True, sort=True).size().reset_index()[CUBE_DIMENSIONS]
+        return cls(
+            cells=cells,
+            count=np.bincount(cell_codes, minlength=n_cells),
+            total=np.bincount(cell_codes, weights=minutes, minlength=n_cells),
+            total_sq=np.bincount(cell_codes, weights=minutes ** 2, minlength=n_cells),
+            sketch=np.bincount(cell_codes * n_bins + bins, minlength=n_cells * n_bins)
+                     .reshape(n_cells, n_bins).astype(np.int32),
+        )
+
+    def save(self, path):
+        """Saves the cube as one compressed .npz file (dimension labels stored as codes)."""
+        categories = {dim: list(self.cells[dim].cat.categories) for dim in CUBE_DIMENSIONS}
+        codes = np.column_stack([self.cells[dim].cat.codes.to_numpy() for dim in CUBE_DIMENSIONS]).astype(np.int16)
+        np.savez_compressed(path, codes=codes, count=self.count, total=self.total, total_sq=self.total_sq,
+                            sketch=self.sketch, categories=json.dumps(categories))
+        print(f"Analysis cube with {len(self.cells)} cells saved as '{path}'")
+
+    @classmethod
+    def load(cls, path):
+        """Loads a cube written by `save`."""
+        data = np.load(path)
+        categories = json.loads(str(data['categories']))
+        cells = pd.DataFrame({
+            dim: pd.Categorical.from_codes(data['codes'][:, i], categories[dim])
+            for i, dim in enumerate(CUBE_DIMENSIONS)
+        })
+        return cls(cells, data['count'], data['total'], data['total_sq'], data['sketch'])
+
+    def query(self, by=(), where=None, quantiles=(0.25, 0.5, 0.75)):
+        """
+        Slices and rolls up the cube.
+
+        Args:
+            by (list): Dimensions to group the result by (empty for one overall row).
+            where (dict): Dimension -> value or list of values to keep,
+                          e.g. {'level': 'MS', 'ell': 'a', 'completed': 'True'}.
+                          Values are compared as strings.
+            quantiles (tuple): Quantiles to estimate from the sketches.
+
+        Returns:
+            pd.DataFrame: count, mean, sd and the requested quantiles (minutes)
+                          per group.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (where or {}).items():
+            values = [values] if isinstance(values, (str, bool, int)) else values
+            mask &= self.cells[dim].astype(str).isin([str(v) for v in values]).to_numpy()
+
+        by = list(by)
+        if by:
+            group_codes, groups = pd.MultiIndex.from_frame(self.cells.loc[mask, by].astype(str)).factorize()
+        else:
+            group_codes, groups = np.zeros(mask.sum(), dtype=int), pd.Index(['All'])
+        n_groups = len(groups)
+
+        count = np.bincount(group_codes, weights=self.count[mask], minlength=n_groups)
+        total = np.bincount(group_codes, weights=self.total[mask], minlength=n_groups)
+        total_sq = np.bincount(group_codes, weights=self.total_sq[mask], minlength=n_groups)
+        sketch = np.zeros((n_groups, self.sketch.shape[1]))
+        np.add.at(sketch, group_codes, self.sketch[mask])
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+            variance = (total_sq - count * mean ** 2) / (count - 1)
+            result = pd.DataFrame({'count': count.astype(int), 'mean': mean,
+                                   'sd': np.sqrt(np.clip(variance, 0, None))}, index=groups)
+            for q in quantiles:
+                result[f'p{round(q * 100)}'] = _sketch_quantile(sketch, count, q)
+
+        if by:
+            result.index.names = by
+        return result.sort_index()
+
+
+def _sketch_quantile(sketch, count, q):
+    """Estimates a quantile per row of histogram sketches, interpolating within log-spaced bins."""
+    cumulative = np.cumsum(sketch, axis=1)
+    target = q * count
+    bin_idx = np.minimum((cumulative < target[:, None]).sum(axis=1), sketch.shape[1] - 1)
+    rows = np.arange(len(sketch))
+    before = np.where(bin_idx > 0, cumulative[rows, np.maximum(bin_idx - 1, 0)], 0)
+    in_bin = sketch[rows, bin_idx]
+    fraction = np.clip((target - before) / np.where(in_bin > 0, in_bin, 1), 0, 1)
+    lower, upper = SKETCH_EDGES[bin_idx], SKETCH_EDGES[bin_idx + 1]
+    return np.where(count > 0, lower * (upper / lower) ** fraction, np.nan)
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    from loader import load_inputs
+    from settings import (HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET,
+                          MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET)
+
+    level_inputs = [
+        ('HS', 'Spring 2025 DDM HS Administration respondent actions.csv',
+         'End activity Spring 2025 DDM HS Administration', (HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET)),
+        ('MS', 'Spring 2025 MS DDM Administration respondent actions.csv',
+         'End activity Spring 2025 MS DDM Administration', (MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET)),
+    ]
+    frames = load_inputs(actions_files=[actions for _, actions, _, _ in level_inputs],
+                         workbooks=[workbook for _, _, _, workbook in level_inputs])
+
+    facts = [
+        assignment_facts(frames[actions], complete_action, level,
+                         frames[workbook[0]][0] if workbook[0] in frames else None)
+        for level, actions, complete_action, workbook in level_inputs if actions in frames
+    ]
+    cube = AnalysisCube.build(pd.concat(facts, ignore_index=True))
+    cube.save('analysis_cube.npz')
+
+    print("\n--- Example: completion minutes by form and pause status (completed, within time limits) ---")
+    print(cube.query(by=['level', 'form', 'paused'],
+                     where={'completed': True, 'within_time_limits': True}).round(1).to_string())
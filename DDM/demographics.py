@@ -1,36 +1,14 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 import re
 import textwrap
 import sys
 
-# --- Configuration (Using XLSX files and sheet names) ---
-HS_EXCEL_FILE = 'Spring 2025 DDM HS Administration answers.xlsx'
-HS_DATA_SHEET = 'Spring 2025 DDM HS Administrati' # The data tab
-HS_VARLIST_SHEET = 'varlist'                      # The varlist tab
-
-MS_EXCEL_FILE = 'Spring 2025 MS DDM Administration answers.xlsx'
-MS_DATA_SHEET = 'Spring 2025 MS DDM Administrati' # The data tab
-MS_VARLIST_SHEET = 'varlist'                      # The varlist tab
-
-# Variables to summarize
-HS_DEMOGRAPHIC_VARS = ['D.03_HSgrade_level', 'D.05_gender', 'race.ethn.r', 'D.10_Native_Language', 'D.11_APcourses', 'D.12_IB']
-MS_DEMOGRAPHIC_VARS = ['D.04_MSgrade_level', 'D.05_gender', 'race.ethn.r', 'D.15_Native_Language', 'D.16_ELL']
-
-# STEM perception variables
-HS_STEM_VARS = {
-    'D.13_STEM_perception 1': 'Confident to be successful in STEM courses',
-    'D.13_STEM_perception 2': 'Interest in more challenging STEM courses',
-    'D.13_STEM_perception 3': 'Many STEM opportunities at school',
-    'D.13_STEM_perception 4': 'Interest in STEM career options after HS'
-}
-MS_STEM_VARS = {
-    'STEM.perception 1': 'Confident to be successful in STEM courses',
-    'STEM.perception 2': 'Interest in more challenging STEM courses',
-    'STEM.perception 3': 'Many STEM opportunities at school',
-    'STEM.perception 4': 'Interest in STEM career options after HS'
-}
+from likert import cached_likert_percentages, likert_percentages
+from sampling import preview_label, sample_students
+from settings import (HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET, HS_DEMOGRAPHIC_VARS, HS_STEM_VARS,
+                      MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET, MS_DEMOGRAPHIC_VARS, MS_STEM_VARS,
+                      PREVIEW_FRACTION, PREVIEW_SEED)
 
 # --- Helper Functions ---
 
@@ -80,13 +58,16 @@ def create_race_variable(df, hispanic_var='D.08_hispanic_YN', race_var='D.09_Rac
     
     return df
 
-def summarize_variable(df, varlist_df, var_name):
+def build_variable_summary(df, varlist_df, var_name):
     """
-    Generates and prints a formatted summary table for a given variable.
+    Builds the summary table for a given variable.
+
+    Returns:
+        tuple: (description, summary_table, n), or None if the variable is missing.
     """
     if var_name not in df.columns:
         print(f"\n--- WARNING: Variable '{var_name}' not found in data ---")
-        return
+        return None
 
     try:
         var_info = varlist_df.loc[var_name]
@@ -98,11 +79,6 @@ def summarize_variable(df, varlist_df, var_name):
     key_col_name = 'possible values' if 'possible values' in var_info else 'key'
     key_dict = parse_key(var_info.get(key_col_name))
 
-    print("\n" + "="*50)
-    print(f"Variable: {var_name}")
-    print(f"Description: {description}")
-    print("="*50)
-
     if "Select all that apply" in str(description) and key_dict:
         all_responses = df[var_name].astype(str).dropna().str.split(',')
         all_options = []
@@ -116,63 +92,90 @@ def summarize_variable(df, varlist_df, var_name):
         summary_table = pd.DataFrame({'Label': counts.index.map(label_map).fillna('Unknown Key'), 
                                       'Count': counts, 
                                       'Percentage': percentages})
-        print(summary_table.to_string())
-        print(f"Total respondents (N) = {len(all_responses)}")
+        return description, summary_table, len(all_responses)
+    
+    counts = df[var_name].value_counts()
+    percentages = df[var_name].value_counts(normalize=True) * 100
     
+    summary_table = pd.DataFrame({'Count': counts, 'Percentage': percentages})
+    
+    if key_dict:
+        summary_table['Label'] = summary_table.index.map(key_dict).fillna('Other/Text')
+        summary_table = summary_table.set_index('Label')
+    elif var_name == 'race.ethn.r':
+        pass
     else:
-        counts = df[var_name].value_counts()
-        percentages = df[var_name].value_counts(normalize=True) * 100
-        
-        summary_table = pd.DataFrame({'Count': counts, 'Percentage': percentages})
+        total_count = summary_table['Count'].sum()
+        top_responses = summary_table.head(10)
+        other_count = summary_table['Count'][10:].sum()
         
-        if key_dict:
-            summary_table['Label'] = summary_table.index.map(key_dict).fillna('Other/Text')
-            summary_table = summary_table.set_index('Label')
-        elif var_name == 'race.ethn.r':
-            pass
-        else:
-            total_count = summary_table['Count'].sum()
-            top_responses = summary_table.head(10)
-            other_count = summary_table['Count'][10:].sum()
+        if other_count > 0:
+            other_row = pd.DataFrame({'Count': [other_count], 'Percentage': [(other_count/total_count)*100]}, index=['Other (Recategorized)'])
+            summary_table = pd.concat([top_responses, other_row])
             
-            if other_count > 0:
-                other_row = pd.DataFrame({'Count': [other_count], 'Percentage': [(other_count/total_count)*100]}, index=['Other (Recategorized)'])
-                summary_table = pd.concat([top_responses, other_row])
-                
-        print(summary_table.to_string())
-        print(f"Total respondents (N) = {counts.sum()}")
-
-def plot_stem_perception(df, stem_vars_map, school_level):
+    return description, summary_table, counts.sum()
+
+def summarize_variable(df, varlist_df, var_name):
+    """
+    Generates and prints a formatted summary table for a given variable.
+    """
+    summary = build_variable_summary(df, varlist_df, var_name)
+    if summary is None:
+        return
+    description, summary_table, n = summary
+
+    print("\n" + "="*50)
+    print(f"Variable: {var_name}")
+    print(f"Description: {description}")
+    print("="*50)
+    print(summary_table.to_string())
+    print(f"Total respondents (N) = {n}")
+
+def stem_perception_summary(df, stem_vars_map):
+    """
+    Computes the percentage of each answer for every STEM perception item.
+
+    Returns:
+        pd.DataFrame: One row per item and one column per answer category,
+                      or None if none of the items are in the data.
+    """
+    summary = likert_percentages({'data': df}, {'data': stem_vars_map})
+    if summary.empty:
+        return None
+    return summary.loc['data']
+
+def cached_stem_summary(school_level, excel_file, data_sheet, stem_vars_map, df=None):
+    """
+    Computes `stem_perception_summary` for a whole answers workbook, cached on
+    the workbook's contents (see likert.cached_likert_percentages).
+    `df` is the already-loaded data tab, used on a cache miss.
+    """
+    summary = cached_likert_percentages({school_level: (excel_file, data_sheet, stem_vars_map, True)},
+                                        frames=None if df is None else {school_level: df})
+    if summary.empty:
+        return None
+    return summary.loc[school_level]
+
+def plot_stem_perception(summary, school_level):
     """
     Generates and saves the stacked bar chart for STEM perception
     with percentage labels inside each segment.
     """
     print(f"\n--- Generating STEM Perception Plot for {school_level} ---")
     
-    answer_map = {
-        'a': 'Describes me exactly',
-        'b': 'Mostly describes me',
-        'c': 'Describes me a little bit',
-        'd': 'Definitely does not describe me',
-        'e': 'Prefer not to answer'
-    }
-    
-    vars_to_plot = [v for v in stem_vars_map.keys() if v in df.columns]
-    if not vars_to_plot:
+    if summary is None:
         print(f"--- WARNING: No STEM perception variables found for {school_level}. Skipping plot. ---")
         return
-        
-    stem_df = df[vars_to_plot].rename(columns=stem_vars_map)
-    df_melted = stem_df.melt(var_name='Question', value_name='Answer Code')
-    df_melted['Answer'] = df_melted['Answer Code'].map(answer_map).fillna('No Answer')
-    summary = df_melted.groupby('Question')['Answer'].value_counts(normalize=True).unstack() * 100
-    
-    categories = ['Describes me exactly', 'Mostly describes me', 'Describes me a little bit', 'Definitely does not describe me', 'Prefer not to answer', 'No Answer']
-    for cat in categories:
-        if cat not in summary.columns:
-            summary[cat] = 0
-    summary = summary[categories]
-    
+
+    plot_stem_summary(summary, school_level)
+
+def plot_stem_summary(summary, school_level):
+    """
+    Draws and saves the STEM perception stacked bar chart from a
+    precomputed percentage table (items as rows, answers as columns).
+    """
+    import matplotlib.pyplot as plt  # imported here so the tables don't need matplotlib
+
     ax = summary.plot(
         kind='barh', 
         stacked=True, 
@@ -229,20 +232,41 @@ def summarize_activities(df, total_unique_students):
     print(f"\nNote: Percentages are based on the total unique student body (N={total_unique_students}).")
     print("The sum of counts may exceed N as students can take multiple activities.")
 
+def read_answers_workbook(excel_file, data_sheet, varlist_sheet):
+    """
+    Reads the data and varlist tabs of an answers workbook in one pass.
+
+    Returns:
+        tuple: (data DataFrame, varlist DataFrame indexed by 'variable').
+    """
+    sheets = pd.read_excel(excel_file, sheet_name=[data_sheet, varlist_sheet])
+    return sheets[data_sheet], sheets[varlist_sheet].set_index('variable')
+
 # --- Main Analysis ---
 
-def run_hs_analysis(excel_file, data_sheet, varlist_sheet):
-    """Runs the full analysis for High School data."""
+def run_hs_analysis(excel_file, data_sheet, varlist_sheet, sheets=None, preview_fraction=None, preview_seed=2025):
+    """
+    Runs the full analysis for High School data.
+    If `sheets` (data, varlist) is given, uses those frames instead of reading the workbook.
+    If `preview_fraction` is given, runs on a stratified sample of students
+    drawn with `preview_seed`.
+    """
     print("#" * 70)
     print("# HIGH SCHOOL DEMOGRAPHIC SUMMARY")
     print("#" * 70)
     
-    try:
-        df = pd.read_excel(excel_file, sheet_name=data_sheet)
-        varlist_df = pd.read_excel(excel_file, sheet_name=varlist_sheet, index_col='variable')
-    except Exception as e:
-        print(f"Error loading Excel file '{excel_file}': {e}")
-        return
+    if sheets is not None:
+        df, varlist_df = sheets
+    else:
+        try:
+            df, varlist_df = read_answers_workbook(excel_file, data_sheet, varlist_sheet)
+        except Exception as e:
+            print(f"Error loading Excel file '{excel_file}': {e}")
+            return
+
+    if preview_fraction:
+        df, sample_info = sample_students(df, preview_fraction, preview_seed)
+        print(f"*** {preview_label(sample_info)} ***")
 
     df = create_race_variable(df)
     
@@ -313,20 +337,35 @@ def run_hs_analysis(excel_file, data_sheet, varlist_sheet):
             summarize_variable(cr4cr_df_unique, varlist_df, var)
 
     # --- Generate HS STEM Plot (using the unique student df) ---
-    plot_stem_perception(df_unique_students, HS_STEM_VARS, 'HS')
+    # A preview sample is not the workbook's data, so it bypasses the cache
+    if preview_fraction:
+        plot_stem_perception(stem_perception_summary(df_unique_students, HS_STEM_VARS), 'HS_PREVIEW')
+    else:
+        plot_stem_perception(cached_stem_summary('HS', excel_file, data_sheet, HS_STEM_VARS, df_unique_students), 'HS')
 
-def run_ms_analysis(excel_file, data_sheet, varlist_sheet):
-    """Runs the 'overall only' analysis for Middle School data."""
+def run_ms_analysis(excel_file, data_sheet, varlist_sheet, sheets=None, preview_fraction=None, preview_seed=2025):
+    """
+    Runs the 'overall only' analysis for Middle School data.
+    If `sheets` (data, varlist) is given, uses those frames instead of reading the workbook.
+    If `preview_fraction` is given, runs on a stratified sample of students
+    drawn with `preview_seed`.
+    """
     print("\n" + "#" * 70)
     print("# MIDDLE SCHOOL DEMOGRAPHIC SUMMARY (OVERALL)")
     print("#" * 70)
     
-    try:
-        df = pd.read_excel(excel_file, sheet_name=data_sheet)
-        varlist_df = pd.read_excel(excel_file, sheet_name=varlist_sheet, index_col='variable')
-    except Exception as e:
-        print(f"Error loading Excel file '{excel_file}': {e}")
-        return
+    if sheets is not None:
+        df, varlist_df = sheets
+    else:
+        try:
+            df, varlist_df = read_answers_workbook(excel_file, data_sheet, varlist_sheet)
+        except Exception as e:
+            print(f"Error loading Excel file '{excel_file}': {e}")
+            return
+
+    if preview_fraction:
+        df, sample_info = sample_students(df, preview_fraction, preview_seed)
+        print(f"*** {preview_label(sample_info)} ***")
 
     df = create_race_variable(df)
     
@@ -344,12 +383,16 @@ def run_ms_analysis(excel_file, data_sheet, varlist_sheet):
         summarize_variable(df_unique_students, varlist_df, var)
         
     # --- Generate MS STEM Plot (using the unique student df) ---
-    plot_stem_perception(df_unique_students, MS_STEM_VARS, 'MS')
+    # A preview sample is not the workbook's data, so it bypasses the cache
+    if preview_fraction:
+        plot_stem_perception(stem_perception_summary(df_unique_students, MS_STEM_VARS), 'MS_PREVIEW')
+    else:
+        plot_stem_perception(cached_stem_summary('MS', excel_file, data_sheet, MS_STEM_VARS, df_unique_students), 'MS')
 
 # --- Main execution ---
 if __name__ == "__main__":
     
-    output_filename = 'demographic_summary.txt'
+    output_filename = 'demographic_summary_PREVIEW.txt' if PREVIEW_FRACTION else 'demographic_summary.txt'
     
     print(f"Starting demographic analysis... All text output will be saved to {output_filename}")
 
@@ -357,10 +400,12 @@ if __name__ == "__main__":
         sys.stdout = f  # Redirect all print() statements to the file 'f'
 
         # Run High School Analysis
-        run_hs_analysis(HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET)
+        run_hs_analysis(HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET, preview_fraction=PREVIEW_FRACTION,
+                        preview_seed=PREVIEW_SEED)
         
         # Run Middle School Analysis
-        run_ms_analysis(MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET)
+        run_ms_analysis(MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET, preview_fraction=PREVIEW_FRACTION,
+                        preview_seed=PREVIEW_SEED)
         
         print("\n" + "="*70)
         print("Demographic analysis complete.")
@@ -0,0 +1,77 @@
+import pandas as pd
+
+PAGE_LOADED_PATTERN = r'^Page (\d+) Loaded$'
+PAGE_NEXT_PATTERN = r'^Page next clicked on page (\d+)$'
+
+
+def compute_page_times(df):
+    """
+    Computes the time each respondent spent on each page, from the
+    'Page N Loaded' event to the matching 'Page next clicked on page N' event.
+
+    Every 'next' click is paired with the most recent 'Loaded' event of the
+    same assignment using a grouped forward fill, so the whole log is handled
+    with array operations. When a click is rejected (e.g. 'Missing answers')
+    and retried, only the last click of that page load counts, so the retries
+    do not add overlapping intervals. Revisited pages are summed into one item
+    time.
+
+    Args:
+        df (pd.DataFrame): Action log with 'Assignment', 'Activities', 'Action'
+                           and a parsed 'datetime' column.
+
+    Returns:
+        pd.DataFrame: One row per (Assignment, Activities, page) with the
+                      'page_seconds' spent on that page.
+    """
+    events = df[['Assignment', 'Activities', 'Action', 'datetime']].sort_values(
+        ['Assignment', 'datetime'], kind='stable'
+    )
+    action = events['Action'].astype(str)
+    loaded_page = pd.to_numeric(action.str.extract(PAGE_LOADED_PATTERN, expand=False))
+    next_page = pd.to_numeric(action.str.extract(PAGE_NEXT_PATTERN, expand=False))
+
+    # Carry the last loaded page and its timestamp forward within each assignment
+    is_loaded = loaded_page.notna()
+    carried = pd.DataFrame({
+        'page': loaded_page,
+        'loaded_at': events['datetime'].where(is_loaded),
+    }).groupby(events['Assignment']).ffill()
+
+    is_click = next_page.notna() & (next_page == carried['page'])
+    clicks = events.loc[is_click, ['Assignment', 'Activities']].copy()
+    clicks['page'] = next_page[is_click].astype(int)
+    clicks['loaded_at'] = carried.loc[is_click, 'loaded_at']
+    clicks['page_seconds'] = (events.loc[is_click, 'datetime'] - clicks['loaded_at']).dt.total_seconds()
+    clicks = clicks.drop_duplicates(subset=['Assignment', 'loaded_at'], keep='last')
+
+    return clicks.groupby(['Assignment', 'Activities', 'page'], as_index=False)['page_seconds'].sum()
+
+
+def compute_effort_indices(df, threshold_fraction=0.10, max_threshold_seconds=10.0):
+    """
+    Flags rapid responses and computes a response-time effort (RTE) index
+    for every respondent.
+
+    A page response is flagged as rapid when its time falls below a normative
+    threshold: `threshold_fraction` of the median time for that page within
+    the same form, capped at `max_threshold_seconds`. The RTE index is the
+    proportion of a respondent's pages that were *not* answered rapidly.
+
+    Args:
+        df (pd.DataFrame): Action log with a parsed 'datetime' column.
+        threshold_fraction (float): Fraction of the page median used as the threshold.
+        max_threshold_seconds (float): Upper cap on any page threshold, in seconds.
+
+    Returns:
+        pd.DataFrame: One row per Assignment with 'pages', 'rapid_pages' and 'rte'.
+    """
+    page_times = compute_page_times(df)
+
+    page_median = page_times.groupby(['Activities', 'page'])['page_seconds'].transform('median')
+    threshold = (page_median * threshold_fraction).clip(upper=max_threshold_seconds)
+    page_times['rapid'] = page_times['page_seconds'] < threshold
+
+    effort = page_times.groupby('Assignment')['rapid'].agg(pages='size', rapid_pages='sum')
+    effort['rte'] = 1 - effort['rapid_pages'] / effort['pages']
+    return effort.reset_index()
@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from navigation import EVENT_TYPES, encode_events
+
+# On-disk layout: one .npy file per column plus a small JSON metadata file
+STORE_COLUMNS = {
+    'assignment': np.int32,
+    'event': np.uint8,
+    'page': np.uint16,
+    'timestamp': np.int64,  # nanoseconds since the epoch
+    'form': np.int16,
+}
+
+
+def write_event_store(df, store_path):
+    """
+    Writes an action log to a compact columnar event store.
+
+    Events are sorted by Assignment and time and encoded with the integer
+    event/page codes from `navigation.encode_events`. An offsets index is
+    written alongside so each assignment's events form one contiguous slice.
+
+    Args:
+        df (pd.DataFrame): Action log with 'Assignment', 'Activities', 'Action'
+                           and a parsed 'datetime' column.
+        store_path (str): Directory to write the store into (created if needed).
+    """
+    os.makedirs(store_path, exist_ok=True)
+    events = encode_events(df)
+
+    form_codes, forms = pd.factorize(events['Activities'], sort=True)
+    columns = {
+        'assignment': events['Assignment'].to_numpy(),
+        'event': events['event'].to_numpy(),
+        'page': events['page'].to_numpy(),
+        'timestamp': events['datetime'].astype('datetime64[ns]').to_numpy().view(np.int64),
+        'form': form_codes,
+    }
+    for name, dtype in STORE_COLUMNS.items():
+        np.save(os.path.join(store_path, f'{name}.npy'), columns[name].astype(dtype))
+
+    # Assignment ids and the start offset of each one's slice (plus a final end offset)
+    assignment = columns['assignment']
+    starts = np.flatnonzero(np.r_[True, assignment[1:] != assignment[:-1]])
+    np.save(os.path.join(store_path, 'assignment_ids.npy'), assignment[starts].astype(np.int32))
+    np.save(os.path.join(store_path, 'offsets.npy'), np.r_[starts, len(assignment)].astype(np.int64))
+
+    with open(os.path.join(store_path, 'metadata.json'), 'w', encoding='utf-8') as f:
+        json.dump({'forms': list(forms), 'event_types': EVENT_TYPES, 'n_events': len(assignment)}, f, indent=2)
+
+    print(f"Event store with {len(assignment)} events for {len(starts)} assignments written to '{store_path}'")
+
+
+class EventStore:
+    """
+    Read-only view of an event store written by `write_event_store`.
+
+    Columns are opened as memory-mapped arrays, so opening a store and
+    slicing out one assignment's events does not read the whole log.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self.columns = {
+            name: np.load(os.path.join(store_path, f'{name}.npy'), mmap_mode='r')
+            for name in STORE_COLUMNS
+        }
+        self.assignment_ids = np.load(os.path.join(store_path, 'assignment_ids.npy'))
+        self.offsets = np.load(os.path.join(store_path, 'offsets.npy'))
+        with open(os.path.join(store_path, 'metadata.json'), encoding='utf-8') as f:
+            metadata = json.load(f)
+        self.forms = metadata['forms']
+        self.event_types = metadata['event_types']
+
+    def __len__(self):
+        return len(self.assignment_ids)
+
+    def _bounds(self, assignment_id):
+        pos = np.searchsorted(self.assignment_ids, assignment_id)
+        if pos == len(self.assignment_ids) or self.assignment_ids[pos] != assignment_id:
+            raise KeyError(f"Assignment {assignment_id} is not in the event store")
+        return self.offsets[pos], self.offsets[pos + 1]
+
+    def events(self, assignment_id):
+        """Returns one assignment's events as zero-copy array slices, keyed by column."""
+        start, stop = self._bounds(assignment_id)
+        return {name: column[start:stop] for name, column in self.columns.items()}
+
+    def timeline(self, assignment_id):
+        """Returns one assignment's events as a readable DataFrame."""
+        events = self.events(assignment_id)
+        return pd.DataFrame({
+            'datetime': pd.to_datetime(np.asarray(events['timestamp'])),
+            'Activities': [self.forms[code] for code in events['form']],
+            'event': [self.event_types[code] for code in events['event']],
+            'page': np.asarray(events['page']),
+        })
+
+    def iter_events(self, assignment_ids=None):
+        """Yields (assignment_id, events) for each assignment, in store order."""
+        ids = self.assignment_ids if assignment_ids is None else assignment_ids
+        for assignment_id in ids:
+            yield assignment_id, self.events(assignment_id)
+
+
+def _apply_to_chunk(store_path, func, assignment_ids):
+    """Worker task: opens the store (memory-mapped) and applies func to each slice."""
+    store = EventStore(store_path)
+    return [(assignment_id, func(events)) for assignment_id, events in store.iter_events(assignment_ids)]
+
+
+def map_assignments(store_path, func, n_workers=None, chunk_size=1000):
+    """
+    Applies a per-assignment function to every assignment's events in parallel.
+
+    Each worker opens the memory-mapped store itself, so only the assignment
+    ids and results travel between processes. `func` must be a module-level
+    function taking the dict returned by `EventStore.events`.
+
+    Returns:
+        pd.Series: func's result per assignment, indexed by Assignment.
+    """
+    assignment_ids = EventStore(store_path).assignment_ids
+    chunks = [assignment_ids[i:i + chunk_size] for i in range(0, len(assignment_ids), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(_apply_to_chunk, [store_path] * len(chunks), [func] * len(chunks), chunks)
+        pairs = [pair for chunk_result in results for pair in chunk_result]
+
+    return pd.Series(dict(pairs), name=getattr(func, '__name__', None)).rename_axis('Assignment')
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    # Usage: python event_store.py <actions.csv> <store_dir> [assignment_id]
+    file_path, store_path = sys.argv[1], sys.argv[2]
+
+    df = pd.read_csv(file_path)
+    df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], errors='coerce')
+    df.dropna(subset=['datetime'], inplace=True)
+    write_event_store(df, store_path)
+
+    if len(sys.argv) > 3:
+        print(EventStore(store_path).timeline(int(sys.argv[3])).to_string())
@@ -0,0 +1,316 @@
+import html
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analysis import load_and_clean_data
+from demographics import (build_variable_summary, cached_stem_summary, create_race_variable,
+                          stem_perception_summary)
+from loader import COT_DIR, load_inputs
+from sampling import preview_label, sample_students
+from settings import (DATASETS_TO_PROCESS, PREVIEW_FRACTION, PREVIEW_SEED,
+                      HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET, HS_DEMOGRAPHIC_VARS, HS_STEM_VARS,
+                      MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET, MS_DEMOGRAPHIC_VARS, MS_STEM_VARS)
+
+# Colors roughly matching the 'Blues_r' colormap used by the PNG charts
+LIKERT_COLORS = ['#08306b', '#2171b5', '#6baed6', '#c6dbef', '#d9d9d9', '#f0f0f0']
+
+PAGE_STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em; color: #222; }
+h1 { border-bottom: 2px solid #444; }
+h2 { margin-top: 2em; border-bottom: 1px solid #aaa; }
+table { border-collapse: collapse; margin: 1em 0; font-size: 13px; }
+th, td { border: 1px solid #ccc; padding: 4px 10px; text-align: center; }
+th { background: #eee; }
+svg text { font-size: 11px; }
+"""
+
+
+# --- Formatting Helpers ---
+
+def format_duration(value):
+    """Formats a Timedelta as HH:MM:SS, matching the PNG summary tables."""
+    if pd.isna(value):
+        return ''
+    total_seconds = int(pd.Timedelta(value).total_seconds())
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def frame_to_html(df, index=True):
+    """Renders a DataFrame as a plain HTML table with escaped cell text."""
+    header_cells = ([html.escape(str(df.index.name or ''))] if index else []) + [html.escape(str(c)) for c in df.columns]
+    rows = ['<tr>' + ''.join(f'<th>{c}</th>' for c in header_cells) + '</tr>']
+    for label, values in zip(df.index, df.itertuples(index=False)):
+        cells = ([html.escape(str(label))] if index else []) + [html.escape(str(v)) for v in values]
+        rows.append('<tr>' + ''.join(f'<td>{c}</td>' for c in cells) + '</tr>')
+    return '<table>\n' + '\n'.join(rows) + '\n</table>'
+
+
+def _nice_step(max_value, target_ticks=8):
+    """Picks a round tick spacing for an axis running from 0 to max_value."""
+    raw = max(max_value, 1) / target_ticks
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for multiple in (1, 2, 2.5, 5, 10):
+        if raw <= multiple * magnitude:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+# --- Tables ---
+
+def duration_stats_table(summary_df):
+    """
+    Builds the per-form statistics table shown in the PNG summary tables.
+
+    Args:
+        summary_df (pd.DataFrame): One row per respondent with 'Activities'
+                                   and a timedelta 'duration' column.
+    """
+    activity_stats = summary_df.groupby('Activities')['duration'].agg(
+        count='size', mean='mean', p25=lambda x: x.quantile(0.25),
+        median='median', p75=lambda x: x.quantile(0.75), min='min', max='max'
+    )
+    for col in ['mean', 'p25', 'median', 'p75', 'min', 'max']:
+        activity_stats[col] = activity_stats[col].map(format_duration)
+    return activity_stats
+
+
+def funnel_table(funnel):
+    """Builds the data cleaning funnel table from (step, count) pairs."""
+    table = pd.DataFrame(funnel, columns=['Step', 'Remaining students'])
+    table['Removed'] = (-table['Remaining students'].diff()).fillna(0).astype(int)
+    return table.set_index('Step')
+
+
+# --- SVG Charts ---
+
+def svg_boxplot(summary_df, reference_minutes=60):
+    """
+    Draws a horizontal boxplot of completion minutes per form as inline SVG,
+    with the mean marked in red and a dashed reference line.
+    Whiskers extend to the most extreme points within 1.5 IQR, as in matplotlib.
+    """
+    minutes = pd.to_timedelta(summary_df['duration']).dt.total_seconds() / 60
+    groups = minutes.groupby(summary_df['Activities'])
+    box = groups.quantile([0.25, 0.5, 0.75]).unstack()
+    box.columns = ['q1', 'median', 'q3']
+    box['mean'] = groups.mean()
+
+    iqr = box['q3'] - box['q1']
+    lower_fence = (box['q1'] - 1.5 * iqr).reindex(summary_df['Activities']).to_numpy()
+    upper_fence = (box['q3'] + 1.5 * iqr).reindex(summary_df['Activities']).to_numpy()
+    inside = (minutes.to_numpy() >= lower_fence) & (minutes.to_numpy() <= upper_fence)
+    box['lo'] = minutes[inside].groupby(summary_df['Activities'][inside]).min()
+    box['hi'] = minutes[inside].groupby(summary_df['Activities'][inside]).max()
+
+    left, width, row_height = 180, 520, 36
+    x_max = max(box['hi'].max(), reference_minutes) * 1.05
+    height = row_height * len(box) + 40
+
+    def x(value):
+        return left + value / x_max * width
+
+    parts = [f'<svg width="{left + width + 20}" height="{height}" xmlns="http://www.w3.org/2000/svg">']
+    step = _nice_step(x_max)
+    for tick in np.arange(0, x_max, step):
+        parts.append(f'<line x1="{x(tick):.1f}" y1="10" x2="{x(tick):.1f}" y2="{height - 30}" stroke="#eee"/>')
+        parts.append(f'<text x="{x(tick):.1f}" y="{height - 15}" text-anchor="middle">{tick:g}</text>')
+
+    for i, (form, row) in enumerate(box.iterrows()):
+        y = 10 + i * row_height + row_height / 2
+        parts.append(f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">{html.escape(str(form))}</text>')
+        parts.append(f'<line x1="{x(row.lo):.1f}" y1="{y}" x2="{x(row.hi):.1f}" y2="{y}" stroke="#555"/>')
+        parts.append(f'<rect x="{x(row.q1):.1f}" y="{y - 10}" width="{x(row.q3) - x(row.q1):.1f}" height="20" '
+                     f'fill="#e0f7fa" stroke="#555"/>')
+        parts.append(f'<line x1="{x(row["median"]):.1f}" y1="{y - 10}" x2="{x(row["median"]):.1f}" y2="{y + 10}" '
+                     f'stroke="#000" stroke-width="2"/>')
+        parts.append(f'<line x1="{x(row["mean"]):.1f}" y1="{y - 12}" x2="{x(row["mean"]):.1f}" y2="{y + 12}" '
+                     f'stroke="red" stroke-width="3"/>')
+        parts.append(f'<text x="{x(row["mean"]) + 4:.1f}" y="{y - 12:.1f}" fill="red">{row["mean"]:.1f}</text>')
+
+    parts.append(f'<line x1="{x(reference_minutes):.1f}" y1="10" x2="{x(reference_minutes):.1f}" y2="{height - 30}" '
+                 f'stroke="blue" stroke-width="2" stroke-dasharray="6,4"/>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def svg_histogram(summary_df, max_minutes=120, bin_interval=5):
+    """Draws a histogram of completion minutes as inline SVG (5-minute bins up to 2 hours)."""
+    minutes = pd.to_timedelta(summary_df['duration']).dt.total_seconds() / 60
+    counts, edges = np.histogram(minutes, bins=np.arange(0, max_minutes + bin_interval, bin_interval))
+
+    left, width, plot_height = 50, 620, 220
+    y_max = max(counts.max(), 1)
+    bar_width = width / len(counts)
+
+    parts = [f'<svg width="{left + width + 20}" height="{plot_height + 50}" xmlns="http://www.w3.org/2000/svg">']
+    for i, count in enumerate(counts):
+        bar_height = count / y_max * plot_height
+        parts.append(f'<rect x="{left + i * bar_width:.1f}" y="{10 + plot_height - bar_height:.1f}" '
+                     f'width="{bar_width:.1f}" height="{bar_height:.1f}" fill="#1f77b4" stroke="#000"/>')
+    for i, edge in enumerate(edges):
+        if i % 2 == 0:
+            parts.append(f'<text x="{left + i * bar_width:.1f}" y="{plot_height + 28}" text-anchor="middle">{edge:g}</text>')
+    parts.append(f'<text x="{left - 6}" y="18" text-anchor="end">{y_max}</text>')
+    parts.append(f'<text x="{left - 6}" y="{plot_height + 10}" text-anchor="end">0</text>')
+    parts.append(f'<text x="{left + width / 2}" y="{plot_height + 46}" text-anchor="middle">Completion Time (Minutes)</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+def svg_stacked_bars(percentages):
+    """
+    Draws 100% stacked horizontal bars (one per Likert item) as inline SVG.
+
+    Args:
+        percentages (pd.DataFrame): Items as rows, answer categories as columns.
+    """
+    left, width, row_height, legend_width = 280, 480, 34, 230
+    height = row_height * len(percentages) + 20
+
+    parts = [f'<svg width="{left + width + legend_width}" height="{max(height, 24 * len(percentages.columns))}" '
+             f'xmlns="http://www.w3.org/2000/svg">']
+    for i, (item, row) in enumerate(percentages.iterrows()):
+        y = 10 + i * row_height
+        parts.append(f'<text x="{left - 8}" y="{y + 18}" text-anchor="end">{html.escape(str(item))}</text>')
+        offset = 0.0
+        for color, value in zip(LIKERT_COLORS, row):
+            segment = value / 100 * width
+            parts.append(f'<rect x="{left + offset:.1f}" y="{y}" width="{segment:.1f}" height="26" fill="{color}"/>')
+            if value > 5:
+                parts.append(f'<text x="{left + offset + segment / 2:.1f}" y="{y + 17}" text-anchor="middle" '
+                             f'fill="{"white" if color in LIKERT_COLORS[:2] else "black"}">{value:.1f}%</text>')
+            offset += segment
+
+    for i, (category, color) in enumerate(zip(percentages.columns, LIKERT_COLORS)):
+        y = 10 + i * 22
+        parts.append(f'<rect x="{left + width + 15}" y="{y}" width="14" height="14" fill="{color}" stroke="#999"/>')
+        parts.append(f'<text x="{left + width + 35}" y="{y + 11}">{html.escape(str(category))}</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+
+# --- Report Assembly ---
+
+def duration_section(title, summary_df, funnel=None, preview=None):
+    """
+    Builds the report section for one completion-time analysis.
+
+    Args:
+        title (str): Section heading (e.g. 'HS_NoPauses').
+        summary_df (pd.DataFrame): One row per respondent with 'Activities' and 'duration'.
+        funnel (list): Optional (step, count) pairs from the cleaning funnel.
+        preview (dict): Sample description if the data is a preview sample.
+    """
+    parts = [f'<h2>Completion Time: {html.escape(title)}</h2>']
+    if preview:
+        parts.append(f'<p style="color: #b00; font-weight: bold">{html.escape(preview_label(preview))}</p>')
+    if funnel:
+        parts += ['<h3>Data Cleaning Funnel</h3>', frame_to_html(funnel_table(funnel))]
+    if summary_df.empty:
+        # e.g. a small preview sample or a strict effort filter left nobody
+        parts.append('<p>No respondents remain after cleaning.</p>')
+        return '\n'.join(parts)
+    parts += [
+        '<h3>Summary Statistics by Test Form</h3>', frame_to_html(duration_stats_table(summary_df)),
+        '<h3>Completion Time by Test Form (Minutes)</h3>', svg_boxplot(summary_df),
+        '<h3>Distribution of Completion Times</h3>', svg_histogram(summary_df),
+    ]
+    return '\n'.join(parts)
+
+
+def demographics_section(title, df, varlist_df, demographic_vars, stem_summary, preview=None):
+    """
+    Builds the report section with demographic tables and the STEM perception
+    chart (`stem_summary` as from demographics.cached_stem_summary, or None).
+    `preview` is the sample description if `df` is a preview sample.
+    """
+    parts = [f'<h2>Demographics: {html.escape(title)} (N={len(df)})</h2>']
+    if preview:
+        parts.append(f'<p style="color: #b00; font-weight: bold">{html.escape(preview_label(preview))}</p>')
+    for var in demographic_vars:
+        summary = build_variable_summary(df, varlist_df, var)
+        if summary is None:
+            continue
+        description, summary_table, n = summary
+        summary_table = summary_table.copy()
+        summary_table['Percentage'] = summary_table['Percentage'].map('{:.1f}%'.format)
+        parts += [f'<h3>{html.escape(str(description))}</h3>', frame_to_html(summary_table), f'<p>N = {n}</p>']
+
+    if stem_summary is not None:
+        parts += ['<h3>STEM Perceptions</h3>', svg_stacked_bars(stem_summary)]
+    return '\n'.join(parts)
+
+
+def write_html_report(sections, output_filename='analysis_report.html', title='Assessment Analysis Report'):
+    """Writes the given HTML sections into a single self-contained report file."""
+    page = [
+        '<!DOCTYPE html>', '<html><head><meta charset="utf-8">',
+        f'<title>{html.escape(title)}</title><style>{PAGE_STYLE}</style></head><body>',
+        f'<h1>{html.escape(title)}</h1>',
+        *sections,
+        '</body></html>',
+    ]
+    with open(output_filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(page))
+    print(f"HTML report saved as '{output_filename}'")
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+
+    sys.path.insert(0, COT_DIR)
+    from response_time import filename as cot_filename, load_cot_times
+    cot_file = os.path.join(COT_DIR, cot_filename)
+    demographic_levels = [
+        ('HS', HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET, HS_DEMOGRAPHIC_VARS, HS_STEM_VARS),
+        ('MS', MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET, MS_DEMOGRAPHIC_VARS, MS_STEM_VARS),
+    ]
+
+    # Read every input file once, concurrently
+    frames = load_inputs(
+        actions_files=[config['file_path'] for config in DATASETS_TO_PROCESS] + [cot_file],
+        workbooks=[(excel_file, data_sheet, varlist_sheet)
+                   for _, excel_file, data_sheet, varlist_sheet, _, _ in demographic_levels],
+    )
+
+    sections = []
+    for config in DATASETS_TO_PROCESS:
+        if config['file_path'] not in frames:
+            continue
+        main_df, time_filtered_df = load_and_clean_data(config, df=frames[config['file_path']])
+        if main_df is None or time_filtered_df is None:
+            continue
+        respondent_activities = main_df.groupby('Assignment')['Activities'].first().reset_index()
+        summary_df = pd.merge(time_filtered_df, respondent_activities, on='Assignment')
+        sections.append(duration_section(config['analysis_name'], summary_df, time_filtered_df.attrs.get('funnel'),
+                                         time_filtered_df.attrs.get('preview')))
+
+    # --- CoT (no pauses, same-day exams) ---
+    if cot_file in frames:
+        cot_times = load_cot_times(cot_file, df=frames[cot_file])
+        cot_no_pause = cot_times[cot_times['HasPause'] == False].rename(columns={'Duration': 'duration'})
+        sections.append(duration_section('CoT_NoPauses', cot_no_pause))
+
+    # --- Demographics ---
+    for level, excel_file, data_sheet, _, demographic_vars, stem_vars in demographic_levels:
+        if excel_file not in frames:
+            continue
+        df, varlist_df = frames[excel_file]
+        sample_info = None
+        if PREVIEW_FRACTION:
+            df, sample_info = sample_students(df, PREVIEW_FRACTION, PREVIEW_SEED)
+        df_unique_students = create_race_variable(df).drop_duplicates(subset=['Student'])
+        # A preview sample is not the workbook's data, so it bypasses the cache
+        if sample_info:
+            stem_summary = stem_perception_summary(df_unique_students, stem_vars)
+        else:
+            stem_summary = cached_stem_summary(level, excel_file, data_sheet, stem_vars, df_unique_students)
+        sections.append(demographics_section(level, df_unique_students, varlist_df, demographic_vars, stem_summary,
+                                             sample_info))
+
+    write_html_report(sections, 'analysis_report_PREVIEW.html' if PREVIEW_FRACTION else 'analysis_report.html')
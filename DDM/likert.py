@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+# Answer codes shared by the STEM perception items of all instruments
+LIKERT_LABELS = {
+    'a': 'Describes me exactly',
+    'b': 'Mostly describes me',
+    'c': 'Describes me a little bit',
+    'd': 'Definitely does not describe me',
+    'e': 'Prefer not to answer',
+}
+NO_ANSWER = 'No Answer'
+PREFER_NOT_CODE = 'e'
+
+LIKERT_CACHE_DIR = '.likert_cache'
+# Part of every cache key; bump whenever answer normalisation or tabulation
+# changes so results cached by older code are not reused
+LIKERT_ENGINE_VERSION = 1
+
+
+def resolve_items(df, items):
+    """
+    Resolves an item specification against a data frame's columns.
+
+    Args:
+        items (dict or str): Column -> label mapping, or a regex matching the
+                             item columns (labels are then derived from the
+                             column names, e.g. 'D.14_STEM_confident 1' ->
+                             'STEM confident 1').
+
+    Returns:
+        dict: Column -> label for the items present in df.
+    """
+    if isinstance(items, str):
+        columns = df.filter(regex=items).columns
+        return {c: re.sub(r'^D\.\d+_', '', c).replace('_', ' ').strip() for c in columns}
+    return {c: label for c, label in items.items() if c in df.columns}
+
+
+def likert_categories(include_prefer_not=True):
+    """Returns the answer categories shown under the given missing-answer policy."""
+    categories = list(LIKERT_LABELS.values()) + [NO_ANSWER]
+    return categories if include_prefer_not else categories[:4]
+
+
+def likert_percentages(frames, items, include_prefer_not=True):
+    """
+    Computes the percentage of each answer for any set of Likert items and
+    instruments in one crosstab.
+
+    All instruments' item columns are stacked into one long frame of
+    (instrument, item, answer) rows, answer codes are normalized to their
+    first letter, and a single normalized crosstab gives every percentage.
+
+    Args:
+        frames (dict): Instrument name -> answers DataFrame.
+        items (dict): Instrument name -> item specification (see `resolve_items`).
+        include_prefer_not (bool or dict): If True, 'Prefer not to answer' and
+                                           missing answers are shown as their own
+                                           categories (the demographics charts).
+                                           If False, they are dropped from the
+                                           denominator (the CoT notebook chart).
+                                           A dict sets the policy per instrument.
+
+    Returns:
+        pd.DataFrame: Indexed by (Instrument, Question), one column per answer
+                      category, in percent. Categories an instrument's policy
+                      excludes are 0 for that instrument.
+    """
+    if not isinstance(include_prefer_not, dict):
+        include_prefer_not = dict.fromkeys(frames, include_prefer_not)
+
+    long_frames = []
+    for instrument, df in frames.items():
+        item_map = resolve_items(df, items[instrument])
+        if not item_map:
+            continue
+        melted = df[list(item_map)].rename(columns=item_map).melt(var_name='Question', value_name='Code')
+        melted.insert(0, 'Instrument', instrument)
+        melted['include_prefer_not'] = include_prefer_not[instrument]
+        long_frames.append(melted)
+
+    policies = [include_prefer_not[instrument] for instrument in frames]
+    categories = likert_categories(any(policies) or not policies)
+    if not long_frames:
+        return pd.DataFrame(columns=categories)
+
+    answers = pd.concat(long_frames, ignore_index=True)
+    codes = answers['Code'].astype('string').str.strip().str.lower().str[0]
+    answers['Answer'] = codes.map(LIKERT_LABELS).fillna(NO_ANSWER)
+    substantive = (codes.isin(list(LIKERT_LABELS)) & (codes != PREFER_NOT_CODE)).fillna(False)
+    answers = answers[answers['include_prefer_not'] | substantive]
+
+    summary = pd.crosstab([answers['Instrument'], answers['Question']], answers['Answer'], normalize='index') * 100
+    return summary.reindex(columns=categories, fill_value=0).rename_axis(columns='Answer')
+
+
+def _file_hash(path):
+    """Returns the SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_answers(path, sheet_name=None):
+    """Reads an answers workbook tab or CSV export, one row per student as in demographics.py."""
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name)
+    if 'Student' in df.columns:
+        df = df.drop_duplicates(subset=['Student'])
+    return df
+
+
+def cached_likert_percentages(sources, cache_dir=LIKERT_CACHE_DIR, frames=None):
+    """
+    Computes `likert_percentages` for several answer files, cached on disk by
+    the hash of the files' contents and LIKERT_ENGINE_VERSION.
+
+    Hashing the files is far cheaper than parsing the workbooks, so repeated
+    runs over unchanged exports skip reading them entirely.
+
+    Args:
+        sources (dict): Instrument name -> (file path, sheet name or None,
+                        item specification, include_prefer_not).
+        cache_dir (str): Directory holding cached results.
+        frames (dict): Optional instrument name -> already-loaded data tab of
+                       that source, used on a cache miss instead of reading
+                       the file.
+
+    Returns:
+        pd.DataFrame: As `likert_percentages`. Missing files are reported and skipped.
+    """
+    frames = frames or {}
+    available = {}
+    for instrument, source in sources.items():
+        if os.path.exists(source[0]):
+            available[instrument] = source
+        else:
+            print(f"Error: The file '{source[0]}' was not found. Skipping {instrument}.")
+
+    key_parts = {
+        'engine': [LIKERT_ENGINE_VERSION, LIKERT_LABELS, NO_ANSWER, PREFER_NOT_CODE],
+        'sources': {
+            instrument: [_file_hash(path), sheet_name, items, include_prefer_not]
+            for instrument, (path, sheet_name, items, include_prefer_not) in available.items()
+        },
+    }
+    cache_key = hashlib.sha256(json.dumps(key_parts, sort_keys=True).encode()).hexdigest()[:16]
+    cache_file = os.path.join(cache_dir, f'likert_{cache_key}.pkl')
+
+    if os.path.exists(cache_file):
+        return pd.read_pickle(cache_file)
+
+    data = {
+        instrument: (frames[instrument].drop_duplicates(subset=['Student']) if instrument in frames
+                     else _read_answers(path, sheet_name))
+        for instrument, (path, sheet_name, _, _) in available.items()
+    }
+    summary = likert_percentages(data, {i: available[i][2] for i in available},
+                                 {i: available[i][3] for i in available})
+
+    os.makedirs(cache_dir, exist_ok=True)
+    summary.to_pickle(cache_file)
+    return summary
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+    from demographics import plot_stem_summary
+    from settings import HS_EXCEL_FILE, HS_DATA_SHEET, HS_STEM_VARS, MS_EXCEL_FILE, MS_DATA_SHEET, MS_STEM_VARS
+
+    # STEM perception items of each instrument (the CoT export names them D.14_STEM_*).
+    # The DDM charts show 'Prefer not to answer' and missing answers; the CoT chart drops them.
+    sources = {
+        'HS': (HS_EXCEL_FILE, HS_DATA_SHEET, HS_STEM_VARS, True),
+        'MS': (MS_EXCEL_FILE, MS_DATA_SHEET, MS_STEM_VARS, True),
+        'CoT': (os.path.join('..', 'CoT', 'data', 'Spring2025_CoT_Answers.csv'), None, r'^D\.14_STEM_.*\d\s*$', False),
+    }
+    summary = cached_likert_percentages(sources)
+
+    print("\n--- STEM Perception (% of respondents) ---")
+    print(summary.round(1).to_string())
+
+    for instrument in summary.index.get_level_values('Instrument').unique():
+        plot_stem_summary(summary.loc[instrument, likert_categories(sources[instrument][3])], instrument)
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from analysis import load_and_clean_data
+from demographics import read_answers_workbook, run_hs_analysis, run_ms_analysis
+from settings import (DATASETS_TO_PROCESS, HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET,
+                      MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET)
+from summary_stats import print_summary_statistics
+
+COT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CoT')
+
+# Column types of the respondent actions exports
+ACTION_DTYPES = {
+    'Assignment': 'int64',
+    'Activities': 'string',
+    'Date': 'string',
+    'Time': 'string',
+    'Action': 'string',
+}
+
+
+def read_actions_csv(file_path):
+    """Reads a respondent actions export with typed columns."""
+    return pd.read_csv(file_path, dtype=ACTION_DTYPES)
+
+
+def load_inputs(actions_files=(), workbooks=(), n_workers=None):
+    """
+    Reads every input file of a run concurrently.
+
+    Actions CSVs are parsed on a thread pool (the C parser releases the GIL);
+    answers workbooks are parsed on a process pool, since openpyxl is pure
+    Python, and each workbook is opened once for both of its tabs. Total
+    I/O time is then roughly that of the largest file.
+
+    Args:
+        actions_files (iterable): Paths of actions CSVs.
+        workbooks (iterable): (excel_file, data_sheet, varlist_sheet) tuples.
+        n_workers (int): Maximum workers per pool (the process pool never
+                         has more workers than workbooks).
+
+    Returns:
+        dict: Path -> DataFrame for each CSV, and path -> (data, varlist)
+              frames for each workbook. Files that fail to load are reported
+              and left out.
+    """
+    actions_files = list(dict.fromkeys(actions_files))
+    workbooks = list(dict.fromkeys(workbooks))
+    frames = {}
+    futures = {}
+
+    # The process pool is created and fed before any reader thread starts, so
+    # its workers are never forked from a multi-threaded parent
+    processes = None
+    if workbooks:
+        processes = ProcessPoolExecutor(max_workers=min(n_workers or os.cpu_count() or 1, len(workbooks)))
+        for excel_file, data_sheet, varlist_sheet in workbooks:
+            futures[excel_file] = processes.submit(read_answers_workbook, excel_file, data_sheet, varlist_sheet)
+
+    try:
+        with ThreadPoolExecutor(max_workers=n_workers) as threads:
+            for path in actions_files:
+                futures[path] = threads.submit(read_actions_csv, path)
+
+            for path, future in futures.items():
+                try:
+                    frames[path] = future.result()
+                except FileNotFoundError:
+                    print(f"Error: The file '{path}' was not found.")
+                except Exception as e:
+                    print(f"Error loading '{path}': {e}")
+    finally:
+        if processes is not None:
+            processes.shutdown()
+
+    return frames
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+
+    sys.path.insert(0, COT_DIR)
+    from response_time import duration_summary, filename as cot_filename, load_cot_times
+    cot_file = os.path.join(COT_DIR, cot_filename)
+
+    start = time.perf_counter()
+    frames = load_inputs(
+        actions_files=[config['file_path'] for config in DATASETS_TO_PROCESS] + [cot_file],
+        workbooks=[(HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET),
+                   (MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET)],
+    )
+    print(f"Loaded {len(frames)} input files in {time.perf_counter() - start:.2f} seconds")
+
+    for config in DATASETS_TO_PROCESS:
+        if config['file_path'] not in frames:
+            continue
+        print("\n" + "="*70)
+        print(f"Starting Analysis: {config['analysis_name']}")
+        main_df, time_filtered_df = load_and_clean_data(config, df=frames[config['file_path']])
+        if main_df is not None and time_filtered_df is not None:
+            print_summary_statistics(main_df, time_filtered_df)
+
+    if cot_file in frames:
+        print("\n" + "="*70)
+        print("Starting Analysis: CoT_NoPauses")
+        cot_times = load_cot_times(cot_file, df=frames[cot_file])
+        no_pause = cot_times[cot_times["HasPause"] == False]
+        print(no_pause.groupby("Activities")["Duration"].apply(duration_summary).unstack().to_string())
+
+    if HS_EXCEL_FILE in frames:
+        run_hs_analysis(HS_EXCEL_FILE, HS_DATA_SHEET, HS_VARLIST_SHEET, sheets=frames[HS_EXCEL_FILE])
+    if MS_EXCEL_FILE in frames:
+        run_ms_analysis(MS_EXCEL_FILE, MS_DATA_SHEET, MS_VARLIST_SHEET, sheets=frames[MS_EXCEL_FILE])
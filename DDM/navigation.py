@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+# Integer codes for the event types in the action logs
+EVENT_TYPES = ['Begin', 'Continue', 'Pause', 'End', 'Page loaded', 'Page next', 'Wrong page', 'Missing answers', 'Other']
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+PAGE_NUMBER_PATTERN = r'^Page (?:next clicked on page )?(\d+)'
+
+
+def encode_events(df):
+    """
+    Encodes each action as an integer (event type, page) pair.
+
+    Events without a page in their text ('Wrong page', 'Missing answers',
+    Begin/End, ...) are attributed to the page most recently loaded in the
+    same assignment, or page 0 before the first page is loaded.
+
+    Args:
+        df (pd.DataFrame): Action log with 'Assignment', 'Activities', 'Action'
+                           and a parsed 'datetime' column.
+
+    Returns:
+        pd.DataFrame: Events sorted by Assignment and time, with integer
+                      'event' and 'page' columns.
+    """
+    events = df[['Assignment', 'Activities', 'Action', 'datetime']].sort_values(
+        ['Assignment', 'datetime'], kind='stable'
+    ).reset_index(drop=True)
+    action = events['Action'].astype(str)
+
+    conditions = [
+        action.str.startswith('Begin activity'),
+        action.str.startswith('Continue activity'),
+        action.str.startswith('Pause activity'),
+        action.str.startswith('End activity'),
+        action.str.endswith(' Loaded') & action.str.startswith('Page '),
+        action.str.startswith('Page next clicked'),
+        action == 'Wrong page',
+        action == 'Missing answers',
+    ]
+    events['event'] = np.select(conditions, range(len(conditions)), default=EVENT_CODES['Other']).astype(np.uint8)
+
+    page = pd.to_numeric(action.str.extract(PAGE_NUMBER_PATTERN, expand=False))
+    loaded_page = page.where(events['event'] == EVENT_CODES['Page loaded'])
+    current_page = loaded_page.groupby(events['Assignment']).ffill().fillna(0)
+    events['page'] = page.fillna(current_page).astype(np.uint16)
+
+    return events.drop(columns=['Action'])
+
+
+def transition_counts(events):
+    """
+    Counts transitions between consecutive (event, page) states per form.
+
+    Consecutive events are compared with shifted arrays; pairs that cross an
+    assignment boundary are masked out. Only observed transitions are kept,
+    so the result is a sparse (coordinate-format) transition matrix.
+
+    Returns:
+        pd.DataFrame: Columns 'Activities', 'from_event', 'from_page',
+                      'to_event', 'to_page' and 'count'.
+    """
+    assignment = events['Assignment'].to_numpy()
+    same_assignment = assignment[1:] == assignment[:-1]
+
+    event = events['event'].to_numpy()
+    page = events['page'].to_numpy()
+    transitions = pd.DataFrame({
+        'Activities': events['Activities'].to_numpy()[1:][same_assignment],
+        'from_event': event[:-1][same_assignment],
+        'from_page': page[:-1][same_assignment],
+        'to_event': event[1:][same_assignment],
+        'to_page': page[1:][same_assignment],
+    })
+    counts = transitions.value_counts(sort=False).rename('count').reset_index()
+
+    for col in ['from_event', 'to_event']:
+        counts[col] = pd.Categorical.from_codes(counts[col], EVENT_TYPES)
+    return counts.sort_values(['Activities', 'from_event', 'from_page', 'to_event', 'to_page'], ignore_index=True)
+
+
+def transition_matrix(counts, form):
+    """Expands one form's sparse transition counts into a from-state x to-state table."""
+    form_counts = counts[counts['Activities'] == form]
+    return form_counts.pivot_table(index=['from_event', 'from_page'], columns=['to_event', 'to_page'],
+                                   values='count', aggfunc='sum', fill_value=0, observed=True)
+
+
+def page_problem_counts(events):
+    """
+    Counts 'Missing answers' and 'Wrong page' events per form and page,
+    alongside the number of times each page was loaded.
+    """
+    tracked = [EVENT_CODES['Page loaded'], EVENT_CODES['Missing answers'], EVENT_CODES['Wrong page']]
+    subset = events[events['event'].isin(tracked)]
+    counts = pd.crosstab([subset['Activities'], subset['page']], subset['event'])
+    counts = counts.reindex(columns=tracked, fill_value=0)
+    counts.columns = ['page_loads', 'missing_answers', 'wrong_page']
+    counts['missing_per_load'] = counts['missing_answers'] / counts['page_loads'].replace(0, np.nan)
+    return counts
+
+
+def back_navigation_rates(events):
+    """
+    Computes how often respondents return to an earlier page, per form.
+
+    A back-navigation is a page load whose page number is lower than the
+    previous page load of the same assignment.
+
+    Returns:
+        pd.DataFrame: Per form, the number of page-to-page moves, back
+                      navigations, the back-navigation rate and the share of
+                      assignments with at least one back navigation.
+    """
+    loads = events[events['event'] == EVENT_CODES['Page loaded']]
+    assignment = loads['Assignment'].to_numpy()
+    page = loads['page'].to_numpy().astype(np.int32)
+
+    same_assignment = assignment[1:] == assignment[:-1]
+    went_back = same_assignment & (page[1:] < page[:-1])
+
+    moves = pd.DataFrame({
+        'Activities': loads['Activities'].to_numpy()[1:][same_assignment],
+        'Assignment': assignment[1:][same_assignment],
+        'back': went_back[same_assignment],
+    })
+    per_assignment = moves.groupby(['Activities', 'Assignment'])['back'].any()
+
+    rates = moves.groupby('Activities')['back'].agg(page_moves='size', back_navigations='sum')
+    rates['back_rate'] = rates['back_navigations'] / rates['page_moves']
+    rates['assignments_with_back'] = per_assignment.groupby('Activities').mean()
+    return rates
+
+
+# --- Main execution block ---
+if __name__ == "__main__":
+
+    for file_path in ['Spring 2025 DDM HS Administration respondent actions.csv',
+                      'Spring 2025 MS DDM Administration respondent actions.csv']:
+        print("\n" + "="*70)
+        print(f"Navigation Analysis: {file_path}")
+        try:
+            df = pd.read_csv(file_path)
+        except FileNotFoundError:
+            print(f"Error: The file '{file_path}' was not found.")
+            continue
+        df['datetime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], errors='coerce')
+        df.dropna(subset=['datetime'], inplace=True)
+
+        events = encode_events(df)
+
+        print("\n--- Back-Navigation Rates by Form ---")
+        print(tabulate(back_navigation_rates(events), headers='keys', tablefmt='psql'))
+
+        print("\n--- Missing Answers and Wrong Page Events by Page ---")
+        print(tabulate(page_problem_counts(events), headers='keys', tablefmt='psql'))
+
+        counts = transition_counts(events)
+        print("\n--- Most Frequent Transitions ---")
+        print(tabulate(counts.nlargest(15, 'count'), headers='keys', tablefmt='psql', showindex=False))
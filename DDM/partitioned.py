@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+NAT = np.iinfo(np.int64).min
+
+
+def _to_shared(array):
+    """Copies an array into a new shared memory block."""
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+
+def _parse_partition(names, n_rows, start, stop, dates, times, date_format):
+    """
+    Worker task: parses timestamps and computes each assignment's time span
+    for one partition.
+
+    The partition's rows are the contiguous slice [start, stop) of the shared
+    input columns. Parsed timestamps are written back row by row, and one row
+    per assignment is written into the shared output columns starting at `start`.
+
+    Returns:
+        tuple: (number of assignments written, dtype pandas parsed the timestamps to).
+    """
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    try:
+        def view(key):
+            return np.ndarray((n_rows,), dtype=np.int64, buffer=blocks[key].buf)
+
+        assignment = view('assignment')[start:stop]
+
+        parsed = pd.to_datetime(pd.Series(dates, dtype=object) + ' ' + pd.Series(times, dtype=object),
+                                format=date_format, errors='coerce')
+        timestamp = parsed.astype('datetime64[ns]').to_numpy().view(np.int64)
+        view('timestamp')[start:stop] = timestamp
+
+        ids, inverse = np.unique(assignment, return_inverse=True)
+        n = len(ids)
+        valid = timestamp != NAT
+
+        first = np.full(n, np.iinfo(np.int64).max)
+        last = np.full(n, NAT)
+        np.minimum.at(first, inverse[valid], timestamp[valid])
+        np.maximum.at(last, inverse[valid], timestamp[valid])
+
+        end = start + n
+        view('out_assignment')[start:end] = ids
+        view('out_first')[start:end] = np.where(last == NAT, NAT, first)
+        view('out_last')[start:end] = last
+        return n, str(parsed.dtype)
+    finally:
+        for block in blocks.values():
+            block.close()
+
+
+def summarize_timestamps(assignment, dates, times, date_format, n_workers):
+    """
+    Parses timestamps and computes each assignment's first/last timestamp on
+    `n_workers` processes, for the time step of `load_and_clean_data`.
+
+    Only the rows that survived the pause and completion filters should be
+    passed in. Rows are partitioned by a hash of Assignment, so every
+    assignment lands in exactly one partition, and reordered so each partition
+    is a contiguous slice. Each worker receives its slice of the Date and Time
+    strings; the assignment ids and all results are exchanged through shared
+    memory.
+
+    Args:
+        assignment (np.ndarray): Assignment id of each row.
+        dates (pd.Series): 'Date' strings of the same rows.
+        times (pd.Series): 'Time' strings of the same rows.
+        date_format (str): Format shared by every row, or None to let each
+                           worker infer it.
+        n_workers (int): Number of partitions and worker processes.
+
+    Returns:
+        tuple: (spans, datetime) where `spans` is indexed by Assignment with
+               'min' and 'max' (NaT when no timestamp parsed), and `datetime`
+               is the parsed timestamp of every row, indexed like `dates`.
+    """
+    assignment = np.asarray(assignment, dtype=np.int64)
+    partition = pd.util.hash_array(assignment) % n_workers
+    order = np.argsort(partition, kind='stable')
+    offsets = np.searchsorted(partition[order], np.arange(n_workers + 1))
+    n_rows = len(assignment)
+    index = dates.index
+    dates = dates.to_numpy(dtype=object)[order]
+    times = times.to_numpy(dtype=object)[order]
+
+    blocks = {
+        'assignment': _to_shared(assignment[order]),
+        'timestamp': _to_shared(np.zeros(n_rows, dtype=np.int64)),
+        'out_assignment': _to_shared(np.zeros(n_rows, dtype=np.int64)),
+        'out_first': _to_shared(np.zeros(n_rows, dtype=np.int64)),
+        'out_last': _to_shared(np.zeros(n_rows, dtype=np.int64)),
+    }
+    try:
+        names = {key: block.name for key, block in blocks.items()}
+        slices = list(zip(offsets[:-1], offsets[1:]))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(
+                _parse_partition,
+                [names] * n_workers, [n_rows] * n_workers, offsets[:-1], offsets[1:],
+                [dates[start:stop] for start, stop in slices],
+                [times[start:stop] for start, stop in slices],
+                [date_format] * n_workers,
+            ))
+
+        def shared(key):
+            return np.ndarray((n_rows,), dtype=np.int64, buffer=blocks[key].buf)
+
+        written = [n for n, _ in results]
+        parsed_dtype = next((dtype for n, dtype in results if n), 'datetime64[ns]')
+
+        # Undo the partition ordering for the per-row timestamps, in the same
+        # resolution a serial pd.to_datetime would have produced
+        timestamp = np.empty(n_rows, dtype=np.int64)
+        timestamp[order] = shared('timestamp')
+        datetime = pd.Series(timestamp.view('datetime64[ns]'), index=index).astype(parsed_dtype)
+
+        # Concatenate each partition's rows from the shared output columns
+        keep = np.concatenate([np.arange(start, start + n) for start, n in zip(offsets[:-1], written)])
+        spans = pd.DataFrame({
+            'min': shared('out_first')[keep].view('datetime64[ns]'),
+            'max': shared('out_last')[keep].view('datetime64[ns]'),
+        }, index=pd.Index(shared('out_assignment')[keep], name='Assignment'))
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return spans.sort_index().astype(parsed_dtype), datetime
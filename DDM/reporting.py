@@ -1,9 +1,16 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
 # Import the functions from your other two files
-from analysis import load_and_clean_data
+from analysis import load_and_clean_data, parse_timestamps, preview_sample
+from density import bin_durations_by_form
+from loader import load_inputs
+from sampling import preview_label
+from settings import DATASETS_TO_PROCESS
 from summary_stats import print_summary_statistics
+from survival import completion_times, kaplan_meier_by_form
+
 
 def create_table_image(main_df, time_filtered_df, analysis_name):
     """
@@ -120,6 +127,59 @@ def create_boxplots(main_df, time_filtered_df, analysis_name):
         print(f"An error occurred while creating the plot: {e}")
 
 
+def create_density_plot(main_df, time_filtered_df, analysis_name, n_bins=120):
+    """
+    Generates and saves a violin-style density chart of completion times,
+    drawn from pre-binned counts instead of individual observations.
+    Keeps the labeled mean for each form and the 1-hour mark of the boxplot.
+    """
+    try:
+        print(f"\nGenerating density plot for {analysis_name}...")
+        respondent_activities = main_df.groupby('Assignment')['Activities'].first().reset_index()
+        plot_df = pd.merge(time_filtered_df, respondent_activities, on='Assignment')
+        plot_df['duration_minutes'] = pd.to_timedelta(plot_df['duration']).dt.total_seconds() / 60
+
+        forms, edges, density, stats = bin_durations_by_form(plot_df, n_bins=n_bins)
+
+        fig, ax = plt.subplots(figsize=(12, 8))
+        for y_pos, (form, row) in enumerate(zip(forms, density), start=1):
+            # Draw each occupied bin over its full width; empty bins (NaN) stay
+            # blank, so sparse tails don't read as whiskers
+            half_width = np.where(row > 0, row * 0.4, np.nan)
+            ax.stairs(y_pos + half_width, edges, baseline=y_pos - half_width, fill=True,
+                      facecolor='lightcyan', edgecolor='gray', linewidth=1)
+            # Quartile box and median on top of the density
+            ax.hlines(y_pos, stats.loc[form, 'p25'], stats.loc[form, 'p75'], color='black', linewidth=4)
+            ax.plot(stats.loc[form, 'median'], y_pos, marker='o', color='white',
+                    markeredgecolor='black', markersize=6, linestyle='None')
+
+        # Mean markers, labeled as in create_boxplots
+        y_ticks = np.arange(1, len(forms) + 1)
+        ax.plot(stats['mean'], y_ticks, marker='|', color='red', markersize=10,
+                markeredgewidth=3, linestyle='None', label='Mean')
+        for mean_val, y_pos in zip(stats['mean'], y_ticks):
+            ax.text(x=mean_val + 0.5, y=y_pos - 0.2, s=f'{mean_val:.1f}',
+                    color='red', va='center', ha='left', fontsize=9)
+
+        ax.axvline(x=60, color='blue', linestyle='--', linewidth=2, label='1 Hour (60 min)')
+        ax.set_yticks(y_ticks)
+        ax.set_yticklabels(forms)
+        ax.legend()
+
+        plt.title(f'Completion Time by Test Form ({analysis_name})')
+        plt.xlabel('Completion Time (Minutes)')
+        plt.ylabel('Test Form')
+        plt.tight_layout()
+
+        output_filename = f'completion_time_density_{analysis_name}.png'
+        plt.savefig(output_filename)
+        print(f"Density plot saved as '{output_filename}'")
+        plt.close()
+
+    except Exception as e:
+        print(f"An error occurred while creating the density plot: {e}")
+
+
 def create_histograms(time_filtered_df, analysis_name):
     """
     Generates and saves a histogram of completion times.
@@ -150,49 +210,90 @@ def create_histograms(time_filtered_df, analysis_name):
     except Exception as e:
         print(f"An error occurred while creating the histogram: {e}")
 
+def create_survival_plot(config, analysis_name, df):
+    """
+    Generates and saves Kaplan-Meier completion curves per test form.
+    Incomplete assignments are kept as right-censored instead of dropped.
+
+    Args:
+        df (pd.DataFrame): The actions frame given to `load_and_clean_data`,
+                           before its completion filter removes incompletes.
+                           In preview mode it is sampled the same way.
+    """
+    try:
+        print(f"\nGenerating completion curves for {analysis_name}...")
+        df, sample_info = preview_sample(df, config)
+        if sample_info:
+            print(f"*** {preview_label(sample_info)} ***")
+        action = df['Action'].astype(str)
+        keep = np.ones(len(df), dtype=bool)
+        if config.get('filter_pauses', True):
+            has_pause = action.str.contains('pause', case=False, na=False)
+            keep = ~df['Assignment'].isin(df.loc[has_pause, 'Assignment']).to_numpy()
+
+        events = df.loc[keep, ['Assignment', 'Activities']].assign(
+            Action=action[keep], datetime=parse_timestamps(df['Date'][keep], df['Time'][keep]))
+        events = events.dropna(subset=['datetime'])
+
+        times = completion_times(events, config['complete_action'])
+        curves, medians = kaplan_meier_by_form(times)
+
+        print("\n--- Kaplan-Meier Median Time to Complete (Minutes) ---")
+        print(medians.round(1).to_string())
+
+        fig, ax = plt.subplots(figsize=(12, 8))
+        for form, curve in curves.groupby('Activities'):
+            ax.step(curve['minutes'], curve['survival'], where='post',
+                    label=f"{form} (median {medians[form]:.1f})")
+
+        ax.axvline(x=60, color='blue', linestyle='--', linewidth=2, label='1 Hour (60 min)')
+        ax.set_xlim(0, 120)
+        ax.set_title(f'Proportion Not Yet Completed by Test Form ({analysis_name})')
+        ax.set_xlabel('Time Since Start (Minutes)')
+        ax.set_ylabel('Proportion Not Yet Completed')
+        ax.legend()
+        plt.tight_layout()
+
+        output_filename = f'completion_survival_{analysis_name}.png'
+        plt.savefig(output_filename)
+        print(f"Completion curves saved as '{output_filename}'")
+        plt.close()
+
+    except Exception as e:
+        print(f"An error occurred while creating the completion curves: {e}")
+
 # --- Main execution block (no changes needed here) ---
 if __name__ == "__main__":
 
-    datasets_to_process = [
-        {
-            'analysis_name': 'HS_NoPauses',
-            'file_path': 'Spring 2025 DDM HS Administration respondent actions.csv',
-            'complete_action': 'End activity Spring 2025 DDM HS Administration',
-            'filter_pauses': True
-        },
-        {
-            'analysis_name': 'MS_NoPauses',
-            'file_path': 'Spring 2025 MS DDM Administration respondent actions.csv',
-            'complete_action': 'End activity Spring 2025 MS DDM Administration',
-            'filter_pauses': True
-        },
-        {
-            'analysis_name': 'HS_WithPauses',
-            'file_path': 'Spring 2025 DDM HS Administration respondent actions.csv',
-            'complete_action': 'End activity Spring 2025 DDM HS Administration',
-            'filter_pauses': False
-        },
-        {
-            'analysis_name': 'MS_WithPauses',
-            'file_path': 'Spring 2025 MS DDM Administration respondent actions.csv',
-            'complete_action': 'End activity Spring 2025 MS DDM Administration',
-            'filter_pauses': False
-        }
-    ]
-
-    for config in datasets_to_process:
+    # Read each actions file once, concurrently; configs sharing a file share the frame
+    frames = load_inputs(actions_files=[config['file_path'] for config in DATASETS_TO_PROCESS])
+
+    for config in DATASETS_TO_PROCESS:
         print("\n" + "="*70)
         print(f"Starting Analysis: {config['analysis_name']}")
         print(f"File: {config['file_path']}")
         
-        main_df, time_filtered_df = load_and_clean_data(config)
+        if config['file_path'] not in frames:
+            continue
+        raw_df = frames[config['file_path']]
+        main_df, time_filtered_df = load_and_clean_data(config, df=raw_df)
+
+        # Preview runs write separately labeled outputs
+        analysis_name = config['analysis_name'] + ('_PREVIEW' if config.get('preview_fraction') else '')
         
         if main_df is not None and time_filtered_df is not None:
-            print(f"\n--- Summary Statistics for {config['analysis_name']} ---")
-            print_summary_statistics(main_df, time_filtered_df)
+            print(f"\n--- Summary Statistics for {analysis_name} ---")
+            print_summary_statistics(main_df, time_filtered_df, bootstrap_cis=config.get('bootstrap_cis', False))
             
-            create_table_image(main_df, time_filtered_df, config['analysis_name'])
+            create_table_image(main_df, time_filtered_df, analysis_name)
             
-            create_boxplots(main_df, time_filtered_df, config['analysis_name'])
+            # 'density' draws from pre-binned counts, for forms with many respondents
+            if config.get('chart_mode', 'box') == 'density':
+                create_density_plot(main_df, time_filtered_df, analysis_name)
+            else:
+                create_boxplots(main_df, time_filtered_df, analysis_name)
             
-            create_histograms(time_filtered_df, config['analysis_name'])
\ No newline at end of file
+            create_histograms(time_filtered_df, analysis_name)
+
+            if config.get('survival_analysis', False):
+                create_survival_plot(config, analysis_name, raw_df)
\ No newline at end of file
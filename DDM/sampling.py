@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+def stratified_sample_ids(strata, fraction, seed=2025):
+    """
+    Draws a reproducible stratified sample of ids.
+
+    Every id gets a uniform random key from a seeded generator (ids are
+    sorted first, so the draw does not depend on file order); within each
+    stratum the ids with the smallest keys are kept, at least one per stratum.
+
+    Args:
+        strata (pd.DataFrame): Indexed by id, one column per stratification variable.
+        fraction (float): Share of ids to keep in each stratum (0 < fraction <= 1).
+        seed (int): Seed for the random keys.
+
+    Returns:
+        pd.Index: The sampled ids.
+    """
+    strata = strata.sort_index()
+    keys = pd.Series(np.random.default_rng(seed).random(len(strata)), index=strata.index)
+    groups = keys.groupby([strata[col] for col in strata.columns], dropna=False)
+    rank = groups.rank(method='first')
+    quota = np.maximum(np.ceil(groups.transform('size') * fraction), 1)
+    return strata.index[(rank <= quota).to_numpy()]
+
+
+def sample_actions(df, complete_action, fraction, seed=2025):
+    """
+    Samples whole assignments from an actions export, stratified by form,
+    pause status and completion status. Every event of a sampled assignment
+    is kept.
+
+    Returns:
+        tuple: (sampled actions DataFrame, dict describing the sample).
+    """
+    action = df['Action'].astype(str)
+    strata = pd.DataFrame({
+        'Activities': df['Activities'],
+        'paused': action.str.contains('pause', case=False, na=False),
+        'completed': action == complete_action,
+    }).groupby(df['Assignment']).agg(Activities=('Activities', 'first'), paused=('paused', 'any'),
+                                      completed=('completed', 'any'))
+
+    sampled_ids = stratified_sample_ids(strata, fraction, seed)
+    sample_info = {'fraction': fraction, 'seed': seed, 'sampled': len(sampled_ids), 'total': len(strata)}
+    return df[df['Assignment'].isin(sampled_ids)], sample_info
+
+
+def sample_students(df, fraction, seed=2025):
+    """
+    Samples whole students from an answers data tab, stratified by activity.
+    Every row of a sampled student is kept.
+
+    Returns:
+        tuple: (sampled answers DataFrame, dict describing the sample).
+    """
+    strata = df.groupby('Student')[['Activities']].first()
+    sampled_ids = stratified_sample_ids(strata, fraction, seed)
+    sample_info = {'fraction': fraction, 'seed': seed, 'sampled': len(sampled_ids), 'total': len(strata)}
+    return df[df['Student'].isin(sampled_ids)], sample_info
+
+
+def preview_label(sample_info):
+    """Returns the banner printed on every output produced from a preview sample."""
+    return (f"PREVIEW SAMPLE: {sample_info['sampled']} of {sample_info['total']} "
+            f"({sample_info['fraction']:.0%} stratified, seed {sample_info['seed']}) - not for reporting")
@@ -0,0 +1,70 @@
+# Shared run configuration for all entry points. Keep this module free of
+# plotting imports so the HTML report and loader start quickly.
+
+# --- Configuration (Using XLSX files and sheet names) ---
+HS_EXCEL_FILE = 'Spring 2025 DDM HS Administration answers.xlsx'
+HS_DATA_SHEET = 'Spring 2025 DDM HS Administrati' # The data tab
+HS_VARLIST_SHEET = 'varlist'                      # The varlist tab
+
+MS_EXCEL_FILE = 'Spring 2025 MS DDM Administration answers.xlsx'
+MS_DATA_SHEET = 'Spring 2025 MS DDM Administrati' # The data tab
+MS_VARLIST_SHEET = 'varlist'                      # The varlist tab
+
+# Variables to summarize
+HS_DEMOGRAPHIC_VARS = ['D.03_HSgrade_level', 'D.05_gender', 'race.ethn.r', 'D.10_Native_Language', 'D.11_APcourses', 'D.12_IB']
+MS_DEMOGRAPHIC_VARS = ['D.04_MSgrade_level', 'D.05_gender', 'race.ethn.r', 'D.15_Native_Language', 'D.16_ELL']
+
+# STEM perception variables
+HS_STEM_VARS = {
+    'D.13_STEM_perception 1': 'Confident to be successful in STEM courses',
+    'D.13_STEM_perception 2': 'Interest in more challenging STEM courses',
+    'D.13_STEM_perception 3': 'Many STEM opportunities at school',
+    'D.13_STEM_perception 4': 'Interest in STEM career options after HS'
+}
+MS_STEM_VARS = {
+    'STEM.perception 1': 'Confident to be successful in STEM courses',
+    'STEM.perception 2': 'Interest in more challenging STEM courses',
+    'STEM.perception 3': 'Many STEM opportunities at school',
+    'STEM.perception 4': 'Interest in STEM career options after HS'
+}
+
+# Set PREVIEW_FRACTION to a fraction (e.g. 0.1) to run every entry point on a
+# stratified sample of students; PREVIEW_SEED fixes which students are drawn
+PREVIEW_FRACTION = None
+PREVIEW_SEED = 2025
+
+# Completion-time analyses run by default (also used by html_report and loader)
+DATASETS_TO_PROCESS = [
+    {
+        'analysis_name': 'HS_NoPauses',
+        'file_path': 'Spring 2025 DDM HS Administration respondent actions.csv',
+        'complete_action': 'End activity Spring 2025 DDM HS Administration',
+        'filter_pauses': True,
+        'preview_fraction': PREVIEW_FRACTION,
+        'preview_seed': PREVIEW_SEED
+    },
+    {
+        'analysis_name': 'MS_NoPauses',
+        'file_path': 'Spring 2025 MS DDM Administration respondent actions.csv',
+        'complete_action': 'End activity Spring 2025 MS DDM Administration',
+        'filter_pauses': True,
+        'preview_fraction': PREVIEW_FRACTION,
+        'preview_seed': PREVIEW_SEED
+    },
+    {
+        'analysis_name': 'HS_WithPauses',
+        'file_path': 'Spring 2025 DDM HS Administration respondent actions.csv',
+        'complete_action': 'End activity Spring 2025 DDM HS Administration',
+        'filter_pauses': False,
+        'preview_fraction': PREVIEW_FRACTION,
+        'preview_seed': PREVIEW_SEED
+    },
+    {
+        'analysis_name': 'MS_WithPauses',
+        'file_path': 'Spring 2025 MS DDM Administration respondent actions.csv',
+        'complete_action': 'End activity Spring 2025 MS DDM Administration',
+        'filter_pauses': False,
+        'preview_fraction': PREVIEW_FRACTION,
+        'preview_seed': PREVIEW_SEED
+    }
+]
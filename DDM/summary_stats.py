@@ -1,7 +1,10 @@
 import pandas as pd
 from tabulate import tabulate
 
-def print_summary_statistics(main_df, time_filtered_df):
+from bootstrap import bootstrap_duration_cis
+from sampling import preview_label
+
+def print_summary_statistics(main_df, time_filtered_df, bootstrap_cis=False, n_resamples=2000):
     """
     Calculates and prints summary statistics for respondent durations,
     grouped by activity.
@@ -10,6 +13,9 @@ def print_summary_statistics(main_df, time_filtered_df):
         main_df (pd.DataFrame): The cleaned DataFrame with all respondent actions.
         time_filtered_df (pd.DataFrame): The DataFrame containing only respondents
                                          who finished within the time limits.
+        bootstrap_cis (bool): If True, also prints 95% bootstrap confidence
+                              intervals for the mean and percentiles.
+        n_resamples (int): Number of bootstrap resamples per form.
     """
     try:
         # Get the activity for each respondent from the main dataframe
@@ -30,6 +36,8 @@ def print_summary_statistics(main_df, time_filtered_df):
         )
 
         print("\n--- Summary Statistics of Respondent Durations ---")
+        if time_filtered_df.attrs.get('preview'):
+            print(f"*** {preview_label(time_filtered_df.attrs['preview'])} ***")
         print("This table shows the distribution of time taken by all respondents, grouped by form.")
         
         # --- Print the Tables ---
@@ -42,5 +50,10 @@ def print_summary_statistics(main_df, time_filtered_df):
         print("\n--- Quantile Summary ---")
         print(tabulate(activity_stats[["p25", "median", "p75"]], headers='keys', tablefmt='psql'))
 
+        if bootstrap_cis:
+            cis = bootstrap_duration_cis(summary_df, n_resamples=n_resamples)
+            print(f"\n--- 95% Bootstrap Confidence Intervals ({n_resamples} resamples) ---")
+            print(tabulate(cis.astype(str), headers='keys', tablefmt='psql'))
+
     except Exception as e:
         print(f"An error occurred in the statistics module: {e}")
\ No newline at end of file
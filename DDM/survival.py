@@ -0,0 +1,72 @@
+import pandas as pd
+
+
+def completion_times(df, complete_action):
+    """
+    Computes each assignment's time to completion, keeping incompletes.
+
+    Completed assignments end at their last `complete_action` event; assignments
+    without one are right-censored at their last recorded event.
+
+    Args:
+        df (pd.DataFrame): Action log with 'Assignment', 'Activities', 'Action'
+                           and a parsed 'datetime' column.
+        complete_action (str): The action that marks a finished assessment.
+
+    Returns:
+        pd.DataFrame: One row per Assignment with 'Activities', 'minutes' and
+                      'completed' (1 = completed, 0 = censored).
+    """
+    completed_at = df['datetime'].where(df['Action'] == complete_action)
+    spans = df.assign(completed_at=completed_at).groupby('Assignment').agg(
+        Activities=('Activities', 'first'),
+        start=('datetime', 'min'),
+        last=('datetime', 'max'),
+        completed_at=('completed_at', 'max'),
+    )
+    spans['completed'] = spans['completed_at'].notna().astype(int)
+    end = spans['completed_at'].fillna(spans['last'])
+    spans['minutes'] = (end - spans['start']).dt.total_seconds() / 60
+    return spans[['Activities', 'minutes', 'completed']].reset_index()
+
+
+def kaplan_meier_by_form(times_df):
+    """
+    Estimates Kaplan-Meier completion curves for every form at once.
+
+    All forms are handled in a single sort by (form, time): event and censor
+    counts are tallied per distinct time, the number still at risk comes from
+    grouped cumulative sums, and the survival product is a grouped
+    cumulative product.
+
+    Args:
+        times_df (pd.DataFrame): Output of `completion_times`.
+
+    Returns:
+        tuple: (curves, medians) where `curves` has one row per form and distinct
+               time with 'at_risk', 'events', 'censored' and 'survival' (the
+               proportion not yet finished), starting from a (0 minutes, 1.0)
+               row per form so step plots begin at the origin, and `medians` is a Series of median
+               minutes to complete per form (NaN if the curve never reaches 0.5).
+    """
+    tallies = (
+        times_df.groupby(['Activities', 'minutes'], sort=True)['completed']
+        .agg(events='sum', n='size')
+        .reset_index()
+    )
+    tallies['censored'] = tallies['n'] - tallies['events']
+
+    # Everyone in the form minus those who already left before this time
+    by_form = tallies.groupby('Activities', sort=False)['n']
+    tallies['at_risk'] = by_form.transform('sum') - by_form.cumsum() + tallies['n']
+    tallies['survival'] = (1 - tallies['events'] / tallies['at_risk']).groupby(tallies['Activities']).cumprod()
+
+    crossed = tallies[tallies['survival'] <= 0.5]
+    medians = crossed.groupby('Activities')['minutes'].first().reindex(tallies['Activities'].unique())
+    medians.name = 'median_minutes'
+
+    # Every curve starts at (0 minutes, survival 1.0), before anyone has finished
+    columns = ['Activities', 'minutes', 'at_risk', 'events', 'censored', 'survival']
+    starts = tallies.groupby('Activities', sort=False).head(1).assign(minutes=0.0, events=0, censored=0, survival=1.0)
+    curves = pd.concat([starts[columns], tallies[columns]]).sort_values(['Activities', 'minutes'], kind='stable')
+    return curves.reset_index(drop=True), medians
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ['Assignment', 'Activities', 'Date', 'Time', 'Action']
+
+# Every action the export is known to produce
+KNOWN_ACTION_PATTERN = (
+    r'^(?:(?:Begin|Continue|Pause|End) activity .+'
+    r'|Page \d+ Loaded'
+    r'|Page next clicked on page \d+'
+    r'|Wrong page'
+    r'|Missing answers)$'
+)
+
+
+def _check(count, examples, description, severity='error'):
+    """Builds one entry of the validation report."""
+    return {
+        'passed': int(count) == 0,
+        'count': int(count),
+        'severity': severity,
+        'description': description,
+        'examples': np.asarray(examples[:5]).tolist(),
+    }
+
+
+def validate_actions(df):
+    """
+    Checks a respondent actions export for schema and integrity problems.
+
+    All row-level flags are computed as vectorized columns and aggregated
+    per assignment in a single groupby, so the whole export is checked in
+    one pass.
+
+    Args:
+        df (pd.DataFrame): The raw actions export, as read by pd.read_csv.
+
+    Returns:
+        dict: Check name -> {'passed', 'count', 'severity', 'description',
+              'examples'}. Examples are Assignment ids (or actions / columns).
+              If required columns are missing, only the schema check is returned.
+    """
+    report = {}
+
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    report['required_columns'] = _check(len(missing_columns), missing_columns, 'Required columns are missing')
+    if missing_columns:
+        return report
+
+    bad_dtypes = []
+    if not pd.api.types.is_integer_dtype(df['Assignment']):
+        bad_dtypes.append('Assignment')
+    for col in ['Activities', 'Date', 'Time', 'Action']:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            bad_dtypes.append(col)
+    report['column_dtypes'] = _check(len(bad_dtypes), bad_dtypes, 'Columns have unexpected dtypes')
+
+    # --- Row-level flags ---
+    action = df['Action'].astype(str)
+    datetime = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), errors='coerce')
+    rows = pd.DataFrame({
+        'Assignment': df['Assignment'],
+        'Activities': df['Activities'],
+        'unparseable_time': datetime.isna(),
+        'duplicate': df.duplicated(keep='first'),
+        'backwards': datetime.groupby(df['Assignment']).diff() < pd.Timedelta(0),
+        'is_begin': action.str.startswith('Begin activity'),
+        'is_end': action.str.startswith('End activity'),
+        'begin_time': datetime.where(action.str.startswith('Begin activity')),
+        'end_time': datetime.where(action.str.startswith('End activity')),
+    })
+    unknown_action = ~action.str.match(KNOWN_ACTION_PATTERN)
+
+    # --- One aggregation per assignment ---
+    per_assignment = rows.groupby('Assignment').agg(
+        unparseable_time=('unparseable_time', 'sum'),
+        duplicates=('duplicate', 'sum'),
+        backwards=('backwards', 'sum'),
+        begins=('is_begin', 'sum'),
+        ends=('is_end', 'sum'),
+        first_begin=('begin_time', 'min'),
+        first_end=('end_time', 'min'),
+        forms=('Activities', 'nunique'),
+    )
+
+    def flagged(mask):
+        return per_assignment.index[mask].to_numpy()
+
+    checks = [
+        ('unparseable_timestamps', per_assignment['unparseable_time'] > 0,
+         'Assignments with Date/Time values that cannot be parsed', 'error'),
+        ('duplicate_rows', per_assignment['duplicates'] > 0,
+         'Assignments with exact duplicate rows', 'warning'),
+        ('non_monotonic_timestamps', per_assignment['backwards'] > 0,
+         'Assignments whose timestamps go backwards in file order', 'warning'),
+        ('multiple_begin_events', per_assignment['begins'] > 1,
+         'Assignments with more than one Begin activity event', 'error'),
+        ('multiple_end_events', per_assignment['ends'] > 1,
+         'Assignments with more than one End activity event', 'error'),
+        ('end_before_begin', per_assignment['first_end'] < per_assignment['first_begin'],
+         'Assignments whose first End comes before their first Begin', 'error'),
+        ('multiple_activities', per_assignment['forms'] > 1,
+         'Assignments spanning more than one Activities value', 'error'),
+    ]
+    for name, mask, description, severity in checks:
+        ids = flagged(mask.to_numpy())
+        report[name] = _check(len(ids), ids, description, severity)
+
+    unknown = np.unique(action[unknown_action].to_numpy())
+    report['unknown_action_templates'] = _check(len(unknown), unknown, 'Actions that match no known template', 'warning')
+
+    return report
+
+
+def print_validation_report(report):
+    """Prints the validation report and returns True if no error-level check failed."""
+    print("\n--- Data Validation Report ---")
+    for name, result in report.items():
+        status = 'OK' if result['passed'] else result['severity'].upper()
+        print(f"[{status:>7}] {name}: {result['count']}")
+        if not result['passed']:
+            print(f"          {result['description']}. Examples: {result['examples']}")
+    print("---------------------------------")
+    return all(result['passed'] or result['severity'] != 'error' for result in report.values())